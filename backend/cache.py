@@ -0,0 +1,48 @@
+"""Small in-process TTL cache shared by routers and services."""
+import threading
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Thread-safe dict with per-entry expiry.
+
+    Entries expire ``ttl`` seconds after being set. When ``maxsize`` is
+    reached the cache is cleared rather than tracking LRU order, which keeps
+    every operation O(1) for the small, hot key sets we cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key for ttl seconds."""
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                self._data.clear()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
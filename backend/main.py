@@ -1,12 +1,21 @@
 """Main FastAPI application."""
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings as app_settings
 from routers import auth, projects, sources, members, jobs, dashboard, users, settings as settings_router, organizations, integrations, billing, chat
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared HTTP clients when the app shuts down."""
+    yield
+    await sources.close_http_client()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=app_settings.APP_NAME,
@@ -16,6 +25,8 @@ app = FastAPI(
     redoc_url="/redoc",
     # Accept both trailing-slash and non-trailing-slash paths.
     redirect_slashes=True,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -25,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
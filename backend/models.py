@@ -297,6 +297,7 @@ class OrgMember(Base):
     )
 
     organization = relationship("Organization", back_populates="members")
+    user = relationship("User")
 
 
 class OrgSetting(Base):
@@ -76,23 +76,30 @@ async def get_clay_activity(
     org_id=Depends(require_org),
 ):
     """Get recent Clay push activity for the org."""
-    logs = (
-        db.query(ClayPushLog)
+    # Select plain columns so rows come back as tuples without ORM hydration
+    rows = (
+        db.query(
+            ClayPushLog.id,
+            ClayPushLog.member_id,
+            ClayPushLog.project_id,
+            ClayPushLog.status,
+            ClayPushLog.pushed_at,
+            ClayPushLog.error_message,
+        )
         .filter(ClayPushLog.org_id == org_id)
         .order_by(desc(ClayPushLog.pushed_at))
         .limit(limit)
-        .all()
     )
     return [
         {
-            "id": str(log.id),
-            "member_id": str(log.member_id),
-            "project_id": str(log.project_id) if log.project_id else None,
-            "status": log.status,
-            "pushed_at": log.pushed_at.isoformat() if log.pushed_at else None,
-            "error_message": log.error_message,
+            "id": str(log_id),
+            "member_id": str(member_id),
+            "project_id": str(project_id) if project_id else None,
+            "status": push_status,
+            "pushed_at": pushed_at.isoformat() if pushed_at else None,
+            "error_message": error_message,
         }
-        for log in logs
+        for log_id, member_id, project_id, push_status, pushed_at, error_message in rows
     ]
 
 
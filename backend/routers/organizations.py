@@ -2,7 +2,7 @@
 from typing import List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, load_only
 from database import get_db
 from auth import get_current_active_user
 from org_context import require_org, require_org_admin
@@ -64,11 +64,11 @@ async def list_organizations(
     current_user: User = Depends(get_current_active_user),
 ):
     """List organizations the current user belongs to."""
-    memberships = db.query(OrgMember).filter(OrgMember.user_id == current_user.id).all()
-    org_ids = [m.org_id for m in memberships]
-    if not org_ids:
-        return []
-    orgs = db.query(Organization).filter(Organization.id.in_(org_ids)).all()
+    orgs = db.query(Organization).options(
+        load_only(Organization.id, Organization.name, Organization.slug, Organization.created_at)
+    ).join(
+        OrgMember, OrgMember.org_id == Organization.id
+    ).filter(OrgMember.user_id == current_user.id).all()
     return [OrgResponse(id=str(o.id), name=o.name, slug=o.slug, created_at=o.created_at) for o in orgs]
 
 
@@ -87,21 +87,21 @@ async def list_members(
     if not membership:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
 
-    members = db.query(OrgMember, User).join(User, OrgMember.user_id == User.id).filter(
-        OrgMember.org_id == org_id
-    ).all()
+    members = db.query(OrgMember).options(
+        joinedload(OrgMember.user).load_only(User.username, User.email, User.full_name)
+    ).filter(OrgMember.org_id == org_id).all()
 
     return [
         OrgMemberResponse(
             id=str(m.id),
-            user_id=str(u.id),
-            username=u.username,
-            email=u.email,
-            full_name=u.full_name,
+            user_id=str(m.user_id),
+            username=m.user.username,
+            email=m.user.email,
+            full_name=m.user.full_name,
             role=m.role,
             joined_at=m.joined_at,
         )
-        for m, u in members
+        for m in members
     ]
 
 
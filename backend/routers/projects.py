@@ -249,26 +249,29 @@ async def trigger_project_sourcing(
             detail="No active community sources found in this project"
         )
     
-    # Create sourcing jobs for each source
+    # Find sources that already have a pending/running job in one round trip
+    busy_source_ids = {
+        row[0] for row in db.query(SourcingJob.source_id).filter(
+            SourcingJob.source_id.in_([src.id for src in sources]),
+            SourcingJob.status.in_(['pending', 'running'])
+        ).group_by(SourcingJob.source_id).all()
+    }
+
+    # Create sourcing jobs for each idle source
     jobs_created = 0
     for src in sources:
-        # Check if there's already a pending/running job for this source
-        existing_job = db.query(SourcingJob).filter(
-            SourcingJob.source_id == src.id,
-            SourcingJob.status.in_(['pending', 'running'])
-        ).first()
-        
-        if not existing_job:
-            job_type = 'repository_sourcing' if src.source_type == 'github_repo' else 'source_ingestion'
-            job = SourcingJob(
-                project_id=project_id,
-                source_id=src.id,
-                job_type=job_type,
-                status='pending',
-                created_by=current_user.id
-            )
-            db.add(job)
-            jobs_created += 1
+        if src.id in busy_source_ids:
+            continue
+        job_type = 'repository_sourcing' if src.source_type == 'github_repo' else 'source_ingestion'
+        job = SourcingJob(
+            project_id=project_id,
+            source_id=src.id,
+            job_type=job_type,
+            status='pending',
+            created_by=current_user.id
+        )
+        db.add(job)
+        jobs_created += 1
     
     db.commit()
     
@@ -1,6 +1,6 @@
 """Settings API router."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from database import get_db
 from auth import get_current_active_user
@@ -8,7 +8,7 @@ from org_context import require_org
 from models import User
 from schemas import AppSettingResponse, AppSettingUpdate
 from settings_service import (
-    get_org_settings, upsert_org_setting, delete_org_setting,
+    get_org_settings_json, upsert_org_setting, delete_org_setting,
     MANAGED_KEYS,
 )
 
@@ -22,7 +22,7 @@ async def list_settings(
     org_id = Depends(require_org),
 ):
     """Get all managed settings for the selected organization. Secrets are masked."""
-    return get_org_settings(db, org_id)
+    return Response(content=get_org_settings_json(db, org_id), media_type="application/json")
 
 
 @router.put("")
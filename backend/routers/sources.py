@@ -1,9 +1,14 @@
 """Community sources router (generalized from repositories)."""
+import base64
+import binascii
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, Header, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from database import get_db
 from auth import get_current_active_user
 from org_context import require_org
@@ -13,27 +18,78 @@ from schemas import (
     SourceDiscoverySearch, SourceDiscoveryResult
 )
 import re
-from github import Github, GithubException
+import httpx
 from settings_service import get_setting
+from cache import TTLCache
 
 router = APIRouter()
 
+# GitHub search results keyed by (org_id, query, limit). Search is limited to
+# 30 req/min, so repeated discovery queries are served from memory.
+_discovery_cache = TTLCache(maxsize=1024, ttl=300)
+
+# Last (ETag, results) per discovery search, kept well past the result
+# cache TTL so expired results can be revalidated with If-None-Match.
+_discovery_etags = TTLCache(maxsize=1024, ttl=3600)
+
+# Shared client so searches reuse keep-alive connections to api.github.com
+_GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+_github_http = httpx.AsyncClient(
+    timeout=15.0,
+    headers={"Accept": "application/vnd.github+json"},
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared GitHub search client (called on app shutdown)."""
+    await _github_http.aclose()
+
+# Time until the next scheduled sourcing run for each sourcing_interval
+_INTERVAL_DELTAS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+    'monthly': timedelta(days=30),
+}
+
+# Columns returned by list_sources (the fields of CommunitySourceResponse)
+_SOURCE_LIST_COLUMNS = tuple(
+    getattr(CommunitySource, name) for name in CommunitySourceResponse.model_fields
+)
+
+# Matches owner/repo in any GitHub URL, stripping a trailing .git and
+# ignoring deeper paths (/tree/main), query strings and fragments.
+_GITHUB_URL_RE = re.compile(r'github\.com/([^/]+)/([^/?#]+?)(?:\.git)?(?:[/?#]|$)')
+_REDDIT_URL_RE = re.compile(r'reddit\.com/r/([^/]+)')
+_X_URL_RE = re.compile(r'(?:twitter|x)\.com/([^/]+)')
+
+
+def _org_project_ids(org_id):
+    """Subquery of project ids owned by an org, used to scope source queries."""
+    return select(Project.id).where(Project.org_id == org_id)
+
+
+def _encode_source_cursor(created_at: datetime, source_id) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{source_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_source_cursor(cursor: str) -> tuple:
+    """Decode a cursor from _encode_source_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, source_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(source_id)
+    except (UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
 
 def parse_github_url(url: str) -> tuple:
     """Parse GitHub URL to extract owner and repo name."""
-    patterns = [
-        r'github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$',
-        r'github\.com/([^/]+)/([^/]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            owner, repo = match.groups()
-            repo = repo.replace('.git', '')
-            return owner, repo
-    
-    raise ValueError("Invalid GitHub URL format")
+    match = _GITHUB_URL_RE.search(url)
+    if not match:
+        raise ValueError("Invalid GitHub URL format")
+    return match.group(1), match.group(2)
 
 
 def detect_source_type(url: str) -> str:
@@ -62,14 +118,14 @@ def parse_source_url(url: str, source_type: str) -> dict:
             'repo_name': repo_name,
         }
     elif source_type == 'reddit_subreddit':
-        match = re.search(r'reddit\.com/r/([^/]+)', url)
+        match = _REDDIT_URL_RE.search(url)
         if match:
             return {'full_name': f"r/{match.group(1)}"}
         raise ValueError("Invalid Reddit URL format")
     elif source_type == 'discord_server':
         return {'full_name': url.split('/')[-1]}
     elif source_type == 'x_account':
-        match = re.search(r'(?:twitter|x)\.com/([^/]+)', url)
+        match = _X_URL_RE.search(url)
         if match:
             return {'full_name': f"@{match.group(1)}"}
         raise ValueError("Invalid X/Twitter URL format")
@@ -77,6 +133,62 @@ def parse_source_url(url: str, source_type: str) -> dict:
         return {'full_name': url}
 
 
+async def _search_github_repositories(
+    github_token: str, query: str, limit: int, cache_key: tuple
+) -> List[SourceDiscoveryResult]:
+    """Run a GitHub repository search, revalidating the last result by ETag.
+
+    GitHub answers a matching If-None-Match with 304 Not Modified, which
+    does not count against the search rate limit.
+    """
+    headers = {"Authorization": f"Bearer {github_token}"}
+    previous = _discovery_etags.get(cache_key)
+    if previous:
+        headers["If-None-Match"] = previous[0]
+
+    try:
+        resp = await _github_http.get(
+            _GITHUB_SEARCH_URL,
+            params={"q": query, "sort": "stars", "order": "desc", "per_page": limit},
+            headers=headers,
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"GitHub search failed: {e}"
+        )
+
+    if resp.status_code == 304 and previous:
+        return previous[1]
+    if resp.status_code != 200:
+        try:
+            message = resp.json().get("message")
+        except ValueError:
+            message = resp.text
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"GitHub search failed: {message}"
+        )
+
+    results = [
+        SourceDiscoveryResult(
+            full_name=item["full_name"],
+            description=item.get("description"),
+            stars=item.get("stargazers_count") or 0,
+            forks=item.get("forks_count") or 0,
+            language=item.get("language"),
+            topics=item.get("topics") or [],
+            url=item["html_url"],
+            source_type='github_repo'
+        )
+        for item in resp.json().get("items", [])[:limit]
+    ]
+    etag = resp.headers.get("ETag")
+    if etag:
+        _discovery_etags.set(cache_key, (etag, results))
+    return results
+
+
 @router.post("/discover", response_model=list[SourceDiscoveryResult])
 async def discover_sources(
     search: SourceDiscoverySearch,
@@ -91,6 +203,11 @@ async def discover_sources(
             detail=f"Discovery not yet supported for source type: {search.source_type}"
         )
 
+    cache_key = (str(org_id), search.query, search.limit)
+    cached = _discovery_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     github_token = get_setting(db, 'GITHUB_TOKEN', org_id=org_id)
     if not github_token:
         raise HTTPException(
@@ -98,28 +215,11 @@ async def discover_sources(
             detail="GitHub token not configured. Set it in Settings > API Keys."
         )
 
-    client = Github(github_token)
-    try:
-        results = client.search_repositories(query=search.query, sort='stars', order='desc')[:search.limit]
-    except GithubException as e:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"GitHub search failed: {e.data.get('message') if hasattr(e, 'data') else str(e)}"
-        )
-
-    return [
-        SourceDiscoveryResult(
-            full_name=repo.full_name,
-            description=repo.description,
-            stars=repo.stargazers_count,
-            forks=repo.forks_count,
-            language=repo.language,
-            topics=repo.get_topics(),
-            url=repo.html_url,
-            source_type='github_repo'
-        )
-        for repo in results
-    ]
+    discovered = await _search_github_repositories(
+        github_token, search.query, search.limit, cache_key
+    )
+    _discovery_cache.set(cache_key, discovered)
+    return discovered
 
 
 @router.post("/", response_model=CommunitySourceResponse, status_code=status.HTTP_201_CREATED)
@@ -159,21 +259,8 @@ async def create_source(
             detail=str(e)
         )
     
-    # Check if source already exists in project
-    existing = db.query(CommunitySource).filter(
-        CommunitySource.project_id == source_data.project_id,
-        CommunitySource.external_url == source_data.external_url
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This source already exists in this project"
-        )
-    
     # Calculate next sourcing time
-    interval_days = {'daily': 1, 'weekly': 7, 'monthly': 30}
-    next_sourcing = datetime.utcnow() + timedelta(days=interval_days[source_data.sourcing_interval])
+    next_sourcing = datetime.now(timezone.utc) + _INTERVAL_DELTAS[source_data.sourcing_interval]
     
     # Create source
     new_source = CommunitySource(
@@ -191,8 +278,15 @@ async def create_source(
     )
     
     db.add(new_source)
-    db.commit()
-    db.refresh(new_source)
+    try:
+        db.flush()  # assigns new_source.id without committing
+    except IntegrityError:
+        # unique (project_id, external_url) rejects duplicates without a pre-insert SELECT
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This source already exists in this project"
+        )
     
     # Create initial sourcing job for every source type.
     # GitHub repos use the legacy 'repository_sourcing' handler;
@@ -208,6 +302,7 @@ async def create_source(
     )
     db.add(sourcing_job)
     db.commit()
+    db.refresh(new_source)
     
     return new_source
 
@@ -216,17 +311,21 @@ async def create_source(
 async def list_sources(
     project_id: UUID = None,
     source_type: str = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     org_id = Depends(require_org),
 ):
-    """List community sources."""
-    query = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        Project.org_id == org_id
+    """List community sources, newest first.
+
+    Pass the X-Next-Cursor header from a previous page as ``cursor`` to
+    page with a keyset seek instead of ``skip``.
+    """
+    # Select only the response columns; plain rows skip ORM hydration
+    query = db.query(*_SOURCE_LIST_COLUMNS).filter(
+        CommunitySource.project_id.in_(_org_project_ids(org_id))
     )
     
     if project_id:
@@ -234,9 +333,30 @@ async def list_sources(
     
     if source_type:
         query = query.filter(CommunitySource.source_type == source_type)
+
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = _decode_source_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(
+            tuple_(CommunitySource.created_at, CommunitySource.id) < (cursor_created_at, cursor_id)
+        )
+    else:
+        query = query.offset(skip)
     
-    sources = query.offset(skip).limit(limit).all()
-    return sources
+    rows = query.order_by(
+        CommunitySource.created_at.desc(), CommunitySource.id.desc()
+    ).limit(limit).all()
+    # Rows hold only JSON-native types plus UUID/datetime, which orjson
+    # serializes directly, so skip the response_model round trip.
+    response = ORJSONResponse([dict(row._mapping) for row in rows])
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = _encode_source_cursor(rows[-1].created_at, rows[-1].id)
+    return response
 
 
 @router.get("/{source_id}", response_model=CommunitySourceResponse)
@@ -247,14 +367,9 @@ async def get_source(
     org_id = Depends(require_org),
 ):
     """Get a specific community source."""
-    source = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        CommunitySource.id == source_id,
-        Project.org_id == org_id
-    ).first()
+    source = db.get(CommunitySource, source_id, options=[joinedload(CommunitySource.project)])
     
-    if not source:
+    if not source or source.project.org_id != org_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found"
@@ -272,14 +387,9 @@ async def update_source(
     org_id = Depends(require_org),
 ):
     """Update a community source."""
-    source = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        CommunitySource.id == source_id,
-        Project.org_id == org_id
-    ).first()
+    source = db.get(CommunitySource, source_id, options=[joinedload(CommunitySource.project)])
     
-    if not source:
+    if not source or source.project.org_id != org_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found"
@@ -287,10 +397,7 @@ async def update_source(
     
     if source_data.sourcing_interval is not None:
         source.sourcing_interval = source_data.sourcing_interval
-        interval_days = {'daily': 1, 'weekly': 7, 'monthly': 30}
-        source.next_sourcing_at = datetime.utcnow() + timedelta(
-            days=interval_days[source_data.sourcing_interval]
-        )
+        source.next_sourcing_at = datetime.now(timezone.utc) + _INTERVAL_DELTAS[source_data.sourcing_interval]
     
     if source_data.is_active is not None:
         source.is_active = source_data.is_active
@@ -316,26 +423,21 @@ async def trigger_sourcing(
     
     Optional body: { "sample_size": 5 } to run a small sample scan.
     """
-    source = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        CommunitySource.id == source_id,
-        Project.org_id == org_id
-    ).first()
+    source = db.get(CommunitySource, source_id, options=[joinedload(CommunitySource.project)])
     
-    if not source:
+    if not source or source.project.org_id != org_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found"
         )
     
     # Check for existing pending/running jobs
-    existing_job = db.query(SourcingJob).filter(
+    job_in_progress = db.query(exists().where(
         SourcingJob.source_id == source_id,
         SourcingJob.status.in_(['pending', 'running'])
-    ).first()
+    )).scalar()
     
-    if existing_job:
+    if job_in_progress:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A sourcing job is already in progress for this source"
@@ -350,20 +452,20 @@ async def trigger_sourcing(
     if sample_size and isinstance(sample_size, int) and sample_size > 0:
         job_metadata['sample_size'] = sample_size
 
-    sourcing_job = SourcingJob(
-        project_id=source.project_id,
-        source_id=source.id,
-        job_type=job_type,
-        status='pending',
-        job_metadata=job_metadata or None,
-        created_by=current_user.id
-    )
-    db.add(sourcing_job)
+    job_id = db.execute(
+        insert(SourcingJob).values(
+            project_id=source.project_id,
+            source_id=source.id,
+            job_type=job_type,
+            status='pending',
+            job_metadata=job_metadata or None,
+            created_by=current_user.id
+        ).returning(SourcingJob.id)
+    ).scalar_one()
     db.commit()
-    db.refresh(sourcing_job)
     
     label = f"Sample scan ({sample_size})" if sample_size else "Sourcing job"
-    return {"message": f"{label} created", "job_id": str(sourcing_job.id)}
+    return {"message": f"{label} created", "job_id": str(job_id)}
 
 
 @router.post("/{source_id}/analyze-stargazers")
@@ -378,14 +480,9 @@ async def trigger_stargazer_analysis(
     
     Optional body: { "sample_size": 5 } to run a small sample scan.
     """
-    source = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        CommunitySource.id == source_id,
-        Project.org_id == org_id
-    ).first()
+    source = db.get(CommunitySource, source_id, options=[joinedload(CommunitySource.project)])
 
-    if not source:
+    if not source or source.project.org_id != org_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found"
@@ -397,13 +494,13 @@ async def trigger_stargazer_analysis(
             detail="Stargazer analysis is only supported for GitHub repositories"
         )
 
-    existing_job = db.query(SourcingJob).filter(
+    job_in_progress = db.query(exists().where(
         SourcingJob.source_id == source_id,
         SourcingJob.job_type == 'stargazer_analysis',
         SourcingJob.status.in_(['pending', 'running'])
-    ).first()
+    )).scalar()
 
-    if existing_job:
+    if job_in_progress:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A stargazer analysis job is already in progress for this source"
@@ -414,19 +511,19 @@ async def trigger_stargazer_analysis(
     if sample_size and isinstance(sample_size, int) and sample_size > 0:
         job_metadata['sample_size'] = sample_size
 
-    sourcing_job = SourcingJob(
-        project_id=source.project_id,
-        source_id=source.id,
-        job_type='stargazer_analysis',
-        status='pending',
-        job_metadata=job_metadata or None,
-        created_by=current_user.id
-    )
-    db.add(sourcing_job)
+    job_id = db.execute(
+        insert(SourcingJob).values(
+            project_id=source.project_id,
+            source_id=source.id,
+            job_type='stargazer_analysis',
+            status='pending',
+            job_metadata=job_metadata or None,
+            created_by=current_user.id
+        ).returning(SourcingJob.id)
+    ).scalar_one()
     db.commit()
-    db.refresh(sourcing_job)
 
-    return {"message": "Stargazer analysis job created", "job_id": str(sourcing_job.id)}
+    return {"message": "Stargazer analysis job created", "job_id": str(job_id)}
 
 
 @router.delete("/{source_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -437,14 +534,9 @@ async def delete_source(
     org_id = Depends(require_org),
 ):
     """Delete a community source."""
-    source = db.query(CommunitySource).join(
-        Project, CommunitySource.project_id == Project.id
-    ).filter(
-        CommunitySource.id == source_id,
-        Project.org_id == org_id
-    ).first()
+    source = db.get(CommunitySource, source_id, options=[joinedload(CommunitySource.project)])
     
-    if not source:
+    if not source or source.project.org_id != org_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found"
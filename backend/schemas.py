@@ -1,11 +1,29 @@
 """Pydantic schemas for API validation."""
-from pydantic import BaseModel, EmailStr, Field, HttpUrl
-from typing import Optional, List, Dict, Any
+import re
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional, List, Dict, Any, Literal, Annotated
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
 
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _check_email_shape(v: str) -> str:
+    v = v.strip()
+    if not _EMAIL_RE.match(v):
+        raise ValueError("value is not a valid email address")
+    # Lower-case the domain like EmailStr does, so lookups match stored emails
+    local, _, domain = v.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# Shape-only email check for lookups of existing users. Skips EmailStr's full
+# syntax parsing but keeps its domain normalization.
+EmailLookup = Annotated[str, AfterValidator(_check_email_shape)]
+
+
 # Auth schemas
 class Token(BaseModel):
     access_token: str
@@ -48,8 +66,7 @@ class UserResponse(UserBase):
     created_at: datetime
     last_login: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -148,8 +165,7 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectStats(BaseModel):
@@ -164,10 +180,13 @@ class ProjectWithStats(ProjectResponse):
 
 
 # Community Source schemas
+SourcingInterval = Literal["daily", "weekly", "monthly"]
+
+
 class CommunitySourceBase(BaseModel):
     source_type: str = Field(default="github_repo")
     external_url: str = Field(..., max_length=500)
-    sourcing_interval: str = Field(default="monthly", pattern="^(daily|weekly|monthly)$")
+    sourcing_interval: SourcingInterval = "monthly"
     source_config: Optional[Dict[str, Any]] = None
 
 
@@ -176,7 +195,7 @@ class CommunitySourceCreate(CommunitySourceBase):
 
 
 class CommunitySourceUpdate(BaseModel):
-    sourcing_interval: Optional[str] = Field(None, pattern="^(daily|weekly|monthly)$")
+    sourcing_interval: Optional[SourcingInterval] = None
     is_active: Optional[bool] = None
     source_config: Optional[Dict[str, Any]] = None
 
@@ -199,8 +218,7 @@ class CommunitySourceResponse(CommunitySourceBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Member schemas
@@ -226,8 +244,7 @@ class MemberResponse(MemberBase):
     following: int = 0
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Member activity schemas
@@ -252,8 +269,7 @@ class MemberActivityResponse(BaseModel):
     is_core_team: bool
     calculated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Social context schemas
@@ -274,8 +290,7 @@ class SocialContextResponse(BaseModel):
     is_verified: bool = False
     last_enriched_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Lead score schemas
@@ -293,8 +308,7 @@ class LeadScoreResponse(BaseModel):
     notes: Optional[str] = None
     calculated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LeadDetail(BaseModel):
@@ -309,7 +323,7 @@ class LeadDetail(BaseModel):
 class SourcingJobCreate(BaseModel):
     project_id: Optional[UUID] = None
     source_id: Optional[UUID] = None
-    job_type: str = Field(..., pattern="^(source_ingestion|social_enrichment|similar_sources|stargazer_analysis)$")
+    job_type: Literal["source_ingestion", "social_enrichment", "similar_sources", "stargazer_analysis"]
     metadata: Optional[Dict[str, Any]] = None
 
 
@@ -330,8 +344,7 @@ class SourcingJobResponse(BaseModel):
     project_name: Optional[str] = None
     source_name: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobProgressResponse(BaseModel):
@@ -347,8 +360,7 @@ class JobProgressResponse(BaseModel):
     completed_at: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SourcingJobWithProgress(SourcingJobResponse):
@@ -427,8 +439,7 @@ class OrgResponse(BaseModel):
     slug: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OrgMemberResponse(BaseModel):
     id: UUID
@@ -440,8 +451,8 @@ class OrgMemberResponse(BaseModel):
     joined_at: datetime
 
 class OrgAddMember(BaseModel):
-    email: EmailStr
-    role: str = Field(default="member", pattern="^(admin|member)$")
+    email: EmailLookup
+    role: Literal["admin", "member"] = "member"
 
 class OrgWithRole(BaseModel):
     id: UUID
@@ -471,8 +482,7 @@ class ChatConversationResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChatConversationListItem(BaseModel):
@@ -1,8 +1,12 @@
 """Service for reading app settings from DB with env var fallback."""
 import os
-from typing import Optional, Dict, List
+import orjson
+from typing import Optional, Dict, Iterator, List, Tuple
+from sqlalchemy import String, any_, bindparam, func
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.orm import Session
-from models import AppSetting
+from models import AppSetting, Organization, OrgMember, OrgSetting
+from cache import TTLCache
 
 
 # Defines which settings are manageable via UI
@@ -180,115 +184,195 @@ MANAGED_SETTINGS = [
     },
 ]
 
-MANAGED_KEYS = {s["key"] for s in MANAGED_SETTINGS}
+MANAGED_KEYS: frozenset[str] = frozenset(s["key"] for s in MANAGED_SETTINGS)
+MANAGED_BY_KEY: Dict[str, Dict] = {s["key"]: s for s in MANAGED_SETTINGS}
+# Sorted so the bound array (and the statement Postgres plans) is identical per call
+MANAGED_KEYS_TUPLE: Tuple[str, ...] = tuple(sorted(MANAGED_KEYS))
+
+# Static part of each get_org_settings entry; only value/is_set/source vary.
+_RESULT_TEMPLATES: Dict[str, Dict] = {
+    s["key"]: {
+        "key": s["key"],
+        "value": "",
+        "description": s["description"],
+        "is_secret": s["is_secret"],
+        "is_set": False,
+        "source": "not_set",
+        "hint": s.get("hint", ""),
+        "help_url": s.get("help_url", ""),
+        "required": s.get("required", False),
+        "placeholder": s.get("placeholder", ""),
+    }
+    for s in MANAGED_SETTINGS
+}
+
+# JSON encoding of each template's static fields, left open for the dynamic ones.
+_STATIC_JSON_PREFIX: Dict[str, bytes] = {
+    key: orjson.dumps({k: v for k, v in tpl.items() if k not in ("value", "is_set", "source")})[:-1]
+    for key, tpl in _RESULT_TEMPLATES.items()
+}
+
+
+# Env vars don't change at runtime; read each one once per process.
+_env_cache: Dict[str, Optional[str]] = {}
+
+
+def _cached_env(key: str) -> Optional[str]:
+    """Return os.environ[key] (or None), memoized for the process lifetime."""
+    try:
+        return _env_cache[key]
+    except KeyError:
+        return _env_cache.setdefault(key, os.environ.get(key))
 
 
 def _is_default_org(db: Session, org_id) -> bool:
-    """Check if an org is the default org (env var fallback allowed)."""
-    from models import Organization
-    org = db.query(Organization).filter(Organization.id == org_id).first()
-    return org is not None and org.slug == 'default'
+    """Check if an org is the default org (env var fallback allowed).
+
+    Memoized on the session so repeated setting reads in one request or job
+    only query the organization once.
+    """
+    cache = db.info.setdefault("_default_org_cache", {})
+    cache_key = str(org_id)
+    if cache_key not in cache:
+        slug = db.query(Organization.slug).filter(Organization.id == org_id).scalar()
+        cache[cache_key] = slug == 'default'
+    return cache[cache_key]
+
+
+# In-process cache for org setting lookups, keyed by (org_id, key).
+# Writes through upsert_org_setting/delete_org_setting invalidate entries;
+# the TTL bounds staleness across worker processes.
+_setting_cache = TTLCache(maxsize=10_000, ttl=60)
+_MISSING = object()
+
+
+def invalidate_setting_cache(org_id, key: str) -> None:
+    """Drop a cached setting so the next read goes to the DB."""
+    _setting_cache.pop((str(org_id), key))
 
 
 def get_setting(db: Session, key: str, default: str = "", org_id=None) -> str:
     """Get a setting value. Org DB → (env var only for default org) → default."""
     if org_id:
-        from models import OrgSetting
-        row = db.query(OrgSetting).filter(
+        cached = _setting_cache.get((str(org_id), key), _MISSING)
+        if cached is not _MISSING:
+            return cached or default
+
+        value = db.query(OrgSetting.value).filter(
             OrgSetting.org_id == org_id,
             OrgSetting.key == key,
-        ).first()
-        if row and row.value:
-            return row.value
-        # Only fall back to env vars for the default org
-        if _is_default_org(db, org_id):
-            return os.getenv(key, default)
-        return default
-    return os.getenv(key, default)
+        ).scalar()
+        if not value:
+            # Only fall back to env vars for the default org; probe the env
+            # first so keys with no env value skip the org lookup entirely.
+            env_value = _cached_env(key)
+            value = env_value if env_value and _is_default_org(db, org_id) else None
+        _setting_cache.set((str(org_id), key), value)
+        return value or default
+    return _cached_env(key) or default
 
 
-def get_org_settings(db: Session, org_id) -> List[Dict]:
-    """Get all managed settings for an organization (secrets masked)."""
-    from models import OrgSetting
-    db_settings = {
-        s.key: s for s in db.query(OrgSetting).filter(
-            OrgSetting.org_id == org_id,
-            OrgSetting.key.in_(MANAGED_KEYS),
-        ).all()
-    }
+def _resolve_org_settings(db: Session, org_id) -> Iterator[Tuple[str, str, bool, str]]:
+    """Yield (key, display_value, is_set, source) for each managed setting."""
+    # One round trip: the org's slug plus any managed settings it has stored
+    rows = db.query(Organization.slug, OrgSetting.key, OrgSetting.value).outerjoin(
+        OrgSetting,
+        (OrgSetting.org_id == Organization.id)
+        & (OrgSetting.key == any_(bindparam("managed_keys", list(MANAGED_KEYS_TUPLE), type_=ARRAY(String)))),
+    ).filter(Organization.id == org_id)
+
+    # Single pass over the result: every row carries the slug, and the outer
+    # join yields one NULL-key row when the org has no stored settings.
+    is_default = False
+    db_settings = {}
+    for slug, key, value in rows:
+        is_default = slug == 'default'
+        if key is not None:
+            db_settings[key] = value
+    db.info.setdefault("_default_org_cache", {})[str(org_id)] = is_default
 
-    is_default = _is_default_org(db, org_id)
-    result = []
     for defn in MANAGED_SETTINGS:
         key = defn["key"]
-        row = db_settings.get(key)
+        stored_value = db_settings.get(key)
         raw_value = ""
         source = "not_set"
 
-        if row and row.value:
-            raw_value = row.value
+        if stored_value:
+            raw_value = stored_value
             source = "database"
-        elif is_default and os.getenv(key):
-            raw_value = os.getenv(key, "")
+        elif is_default and _cached_env(key):
+            raw_value = _cached_env(key)
             source = "environment"
 
         is_set = bool(raw_value)
         display_value = ""
         if is_set and defn["is_secret"]:
-            display_value = raw_value[:4] + "****" + raw_value[-4:] if len(raw_value) > 8 else "****"
+            display_value = f"{raw_value[:4]}****{raw_value[-4:]}" if len(raw_value) > 8 else "****"
         elif is_set:
             display_value = raw_value
 
-        result.append({
-            "key": key,
-            "value": display_value,
-            "description": defn["description"],
-            "is_secret": defn["is_secret"],
-            "is_set": is_set,
-            "source": source,
-            "hint": defn.get("hint", ""),
-            "help_url": defn.get("help_url", ""),
-            "required": defn.get("required", False),
-            "placeholder": defn.get("placeholder", ""),
-        })
+        yield key, display_value, is_set, source
+
 
+def get_org_settings(db: Session, org_id) -> List[Dict]:
+    """Get all managed settings for an organization (secrets masked)."""
+    result = []
+    for key, display_value, is_set, source in _resolve_org_settings(db, org_id):
+        out = _RESULT_TEMPLATES[key].copy()
+        out["value"] = display_value
+        out["is_set"] = is_set
+        out["source"] = source
+        result.append(out)
     return result
 
 
+def get_org_settings_json(db: Session, org_id) -> bytes:
+    """Same as get_org_settings, serialized to a JSON array.
+
+    Only value/is_set/source are encoded per request; the static fields come
+    from the prebuilt _STATIC_JSON_PREFIX fragments.
+    """
+    parts = [
+        b"".join((
+            _STATIC_JSON_PREFIX[key],
+            b',"value":', orjson.dumps(display_value),
+            b',"is_set":', b"true" if is_set else b"false",
+            b',"source":"', source.encode(), b'"}',
+        ))
+        for key, display_value, is_set, source in _resolve_org_settings(db, org_id)
+    ]
+    return b"[" + b",".join(parts) + b"]"
+
+
 def upsert_org_setting(db: Session, org_id, key: str, value: str):
     """Create or update an org setting."""
-    from models import OrgSetting
-    defn = next((s for s in MANAGED_SETTINGS if s["key"] == key), None)
+    defn = MANAGED_BY_KEY.get(key)
     if not defn:
         raise ValueError(f"Unknown setting key: {key}")
 
-    row = db.query(OrgSetting).filter(
-        OrgSetting.org_id == org_id,
-        OrgSetting.key == key,
-    ).first()
-    if not row:
-        row = OrgSetting(
-            org_id=org_id,
-            key=key,
-            value=value,
-            is_secret=defn["is_secret"],
-        )
-        db.add(row)
-    else:
-        row.value = value
+    stmt = pg_insert(OrgSetting).values(
+        org_id=org_id,
+        key=key,
+        value=value,
+        is_secret=defn["is_secret"],
+    ).on_conflict_do_update(
+        index_elements=[OrgSetting.org_id, OrgSetting.key],
+        set_={"value": value, "updated_at": func.now()},
+    ).returning(OrgSetting)
+    row = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(row)
+    invalidate_setting_cache(org_id, key)
     return row
 
 
 def delete_org_setting(db: Session, org_id, key: str):
     """Delete an org setting (reverts to env var fallback)."""
-    from models import OrgSetting
     db.query(OrgSetting).filter(
         OrgSetting.org_id == org_id,
         OrgSetting.key == key,
     ).delete()
     db.commit()
+    invalidate_setting_cache(org_id, key)
 
 
 def get_excluded_organizations(db: Session, org_id) -> list[str]:
@@ -301,6 +385,5 @@ def get_excluded_organizations(db: Session, org_id) -> list[str]:
 
 def get_user_org_id(db: Session, user_id):
     """Get the org_id for a user (returns first org they belong to, or None)."""
-    from models import OrgMember
     member = db.query(OrgMember).filter(OrgMember.user_id == user_id).first()
     return member.org_id if member else None
@@ -0,0 +1,4 @@
+-- Covering index for org-scoped source lookups:
+-- community_sources.project_id IN (SELECT id FROM projects WHERE org_id = ?)
+-- can be answered with an index-only scan on projects.
+CREATE INDEX IF NOT EXISTS idx_projects_org_id_id ON projects(org_id, id);
@@ -0,0 +1,6 @@
+-- Partial index for the "job already in progress" guards.
+-- Only pending/running jobs are indexed, so it stays small and
+-- EXISTS lookups by source (and job type) hit a single index page.
+CREATE INDEX IF NOT EXISTS idx_sourcing_jobs_active_source
+    ON sourcing_jobs(source_id, job_type)
+    WHERE status IN ('pending', 'running');
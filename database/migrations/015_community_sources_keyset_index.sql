@@ -0,0 +1,10 @@
+-- Keyset pagination indexes for list_sources:
+-- ORDER BY created_at DESC, id DESC with a (created_at, id) < (?, ?) seek.
+-- The per-project index serves listings filtered to one project_id.
+CREATE INDEX IF NOT EXISTS idx_community_sources_project_created
+    ON community_sources(project_id, created_at DESC, id DESC);
+-- The org-wide listing filters project_id IN (...) over several projects,
+-- which the per-project index can't return in created_at order; walk this
+-- one instead and filter project_id as rows are read.
+CREATE INDEX IF NOT EXISTS idx_community_sources_created
+    ON community_sources(created_at DESC, id DESC);
@@ -0,0 +1,8 @@
+-- The (source, member), (project, member), social_context(member) and
+-- members(github_id) lookups are already served by their UNIQUE
+-- constraints. The plain indexes on the same leading columns only add
+-- write cost to the batch upserts, so drop them.
+DROP INDEX IF EXISTS idx_members_github_id;
+DROP INDEX IF EXISTS idx_community_members_source;
+DROP INDEX IF EXISTS idx_member_activity_source;
+DROP INDEX IF EXISTS idx_social_context_member;
@@ -0,0 +1,5 @@
+-- Partial index for claim_pending_jobs:
+-- WHERE status = 'pending' ORDER BY created_at LIMIT n FOR UPDATE SKIP LOCKED.
+CREATE INDEX IF NOT EXISTS idx_sourcing_jobs_pending_created
+    ON sourcing_jobs(created_at)
+    WHERE status = 'pending';
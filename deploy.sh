@@ -300,6 +300,11 @@ MIGRATIONS=(
   database/migrations/010_community_generalization.sql
   database/migrations/011_nullable_github_fields.sql
   database/migrations/012_add_lead_owner.sql
+  database/migrations/013_source_org_scope_index.sql
+  database/migrations/014_active_jobs_partial_index.sql
+  database/migrations/015_community_sources_keyset_index.sql
+  database/migrations/016_drop_redundant_member_indexes.sql
+  database/migrations/017_job_claim_index.sql
 )
 
 for f in "${MIGRATIONS[@]}"; do
@@ -1,6 +1,9 @@
 """Lightweight billing helper for jobs metering."""
+import functools
 import logging
 import os
+import threading
+import time
 from decimal import Decimal
 from typing import Optional, Tuple
 from uuid import UUID
@@ -8,11 +11,80 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from models import OrgMember
-
 logger = logging.getLogger(__name__)
 
 
+# Statements are built once at import and reused by every deduction.
+_SELECT_BILLING = text(
+    """
+    SELECT credit_balance, COALESCE(is_byok, false) AS is_byok, COALESCE(is_enterprise, false) AS is_enterprise
+    FROM org_billing
+    WHERE org_id = :org_id
+    """
+)
+
+_DEDUCT_BILLING = text(
+    """
+    UPDATE org_billing
+    SET credit_balance = credit_balance - :total,
+        total_credits_used = COALESCE(total_credits_used, 0) + :total,
+        total_enrichments = COALESCE(total_enrichments, 0) + :n,
+        updated_at = NOW()
+    WHERE org_id = :org_id
+      AND credit_balance >= :total
+      AND NOT COALESCE(is_byok, false)
+      AND NOT COALESCE(is_enterprise, false)
+    RETURNING credit_balance
+    """
+)
+
+_INSERT_CREDIT_TX = text(
+    """
+    INSERT INTO credit_transactions (
+      org_id, type, amount, balance_after, description, job_id, member_id
+    ) VALUES (
+      :org_id, 'deduction', :amount, :balance_after, :description, :job_id, :member_id
+    )
+    """
+)
+
+_INSERT_USAGE_EVENT = text(
+    """
+    INSERT INTO usage_events (
+      org_id, event_type, cost, job_id, member_id, is_byok
+    ) VALUES (
+      :org_id, 'enrichment', :cost, :job_id, :member_id, false
+    )
+    """
+)
+
+
+# Fail-open warnings are rate limited so a persistent DB problem logs once per
+# window instead of once per enriched member.
+_WARN_INTERVAL_SECONDS = 5.0
+_warn_lock = threading.Lock()
+_warn_state = {"last": 0.0, "dropped": 0}
+
+
+def _warn_metering_failed(exc: Exception) -> None:
+    with _warn_lock:
+        now = time.monotonic()
+        if now - _warn_state["last"] < _WARN_INTERVAL_SECONDS:
+            _warn_state["dropped"] += 1
+            return
+        dropped = _warn_state["dropped"]
+        _warn_state["last"] = now
+        _warn_state["dropped"] = 0
+    if dropped:
+        logger.warning(
+            "Billing metering failed (allowing job): %s (%d similar warnings suppressed)",
+            exc, dropped,
+        )
+    else:
+        logger.warning("Billing metering failed (allowing job): %s", exc)
+
+
+@functools.lru_cache(maxsize=1)
 def _enrichment_cost() -> Decimal:
     raw = os.getenv("ENRICHMENT_CREDIT_COST", "0.01")
     try:
@@ -21,10 +93,11 @@ def _enrichment_cost() -> Decimal:
         return Decimal("0.01")
 
 
-def get_user_org_id(db: Session, user_id: UUID) -> Optional[UUID]:
-    """Resolve org membership for a user."""
-    member = db.query(OrgMember).filter(OrgMember.user_id == user_id).first()
-    return member.org_id if member else None
+@functools.lru_cache(maxsize=1)
+def _enrichment_cost_params() -> Tuple[str, str]:
+    """Bind-ready (cost, -cost) strings for one enrichment, computed once."""
+    cost = _enrichment_cost()
+    return str(cost), str(-cost)
 
 
 def check_and_deduct(
@@ -39,112 +112,52 @@ def check_and_deduct(
     - If billing tables/rows are not initialized yet, allow processing.
     - If metering write fails unexpectedly, allow processing and log warning.
     """
-    cost = _enrichment_cost()
+    s_cost, s_amount = _enrichment_cost_params()
+    s_org = str(org_id)
+    s_job = str(job_id)
+    s_member = str(contributor_id)
 
     try:
-        row = db.execute(
-            text(
-                """
-                SELECT credit_balance, COALESCE(is_byok, false) AS is_byok, COALESCE(is_enterprise, false) AS is_enterprise
-                FROM org_billing
-                WHERE org_id = :org_id
-                FOR UPDATE
-                """
-            ),
-            {"org_id": str(org_id)},
-        ).mappings().first()
+        # Guarded decrement: one round trip, and the row lock is only held by the UPDATE.
+        row = db.execute(_DEDUCT_BILLING, {"org_id": s_org, "total": s_cost, "n": 1}).first()
 
         if not row:
-            # No billing account yet: don't block jobs.
-            return True, None
-
-        balance = Decimal(str(row["credit_balance"] or 0))
-        if row["is_byok"] or row["is_enterprise"]:
-            return True, float(balance)
-
-        if balance < cost:
-            db.rollback()
-            return False, float(balance)
-
-        new_balance = balance - cost
-
-        db.execute(
-            text(
-                """
-                UPDATE org_billing
-                SET credit_balance = :new_balance,
-                    total_credits_used = COALESCE(total_credits_used, 0) + :cost,
-                    total_enrichments = COALESCE(total_enrichments, 0) + 1,
-                    updated_at = NOW()
-                WHERE org_id = :org_id
-                """
-            ),
-            {
-                "org_id": str(org_id),
-                "new_balance": str(new_balance),
-                "cost": str(cost),
-            },
-        )
-
-        # Best-effort journaling; ignore if older schemas don't have these columns yet.
+            account = db.execute(_SELECT_BILLING, {"org_id": s_org}).mappings().first()
+            if not account:
+                # No billing account yet: don't block jobs.
+                return True, None
+            balance = float(account["credit_balance"] or 0)
+            if account["is_byok"] or account["is_enterprise"]:
+                return True, balance
+            return False, balance
+
+        # The driver already returns credit_balance as a Decimal; bind it as-is.
+        new_balance = row[0]
+
+        # Best-effort journaling; a SAVEPOINT keeps the balance UPDATE intact
+        # if older schemas don't have these columns yet.
         try:
-            db.execute(
-                text(
-                    """
-                    INSERT INTO credit_transactions (
-                      org_id, type, amount, balance_after, description, job_id, contributor_id
-                    ) VALUES (
-                      :org_id, 'deduction', :amount, :balance_after, :description, :job_id, :contributor_id
-                    )
-                    """
-                ),
-                {
-                    "org_id": str(org_id),
-                    "amount": str(-cost),
-                    "balance_after": str(new_balance),
-                    "description": "Lead enrichment credit deduction",
-                    "job_id": str(job_id),
-                    "contributor_id": str(contributor_id),
-                },
-            )
-        except Exception:
-            db.rollback()
-            db.execute(
-                text(
-                    """
-                    UPDATE org_billing
-                    SET credit_balance = :new_balance,
-                        total_credits_used = COALESCE(total_credits_used, 0) + :cost,
-                        total_enrichments = COALESCE(total_enrichments, 0) + 1,
-                        updated_at = NOW()
-                    WHERE org_id = :org_id
-                    """
-                ),
-                {
-                    "org_id": str(org_id),
-                    "new_balance": str(new_balance),
-                    "cost": str(cost),
-                },
-            )
+            with db.begin_nested():
+                db.execute(
+                    _INSERT_CREDIT_TX,
+                    {
+                        "org_id": s_org,
+                        "amount": s_amount,
+                        "balance_after": new_balance,
+                        "description": "Lead enrichment credit deduction",
+                        "job_id": s_job,
+                        "member_id": s_member,
+                    },
+                )
+        except Exception as exc:
+            logger.warning("Billing journaling failed: %s", exc)
 
         try:
-            db.execute(
-                text(
-                    """
-                    INSERT INTO usage_events (
-                      org_id, event_type, cost, job_id, contributor_id, is_byok
-                    ) VALUES (
-                      :org_id, 'enrichment', :cost, :job_id, :contributor_id, false
-                    )
-                    """
-                ),
-                {
-                    "org_id": str(org_id),
-                    "cost": str(cost),
-                    "job_id": str(job_id),
-                    "contributor_id": str(contributor_id),
-                },
-            )
+            with db.begin_nested():
+                db.execute(
+                    _INSERT_USAGE_EVENT,
+                    {"org_id": s_org, "cost": s_cost, "job_id": s_job, "member_id": s_member},
+                )
         except Exception:
             pass
 
@@ -152,5 +165,5 @@ def check_and_deduct(
         return True, float(new_balance)
     except Exception as exc:
         db.rollback()
-        logger.warning("Billing metering failed (allowing job): %s", exc)
+        _warn_metering_failed(exc)
         return True, None
@@ -1,5 +1,7 @@
 """Database connection for job processor."""
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import config
 
@@ -7,8 +9,14 @@ from config import config
 engine = create_engine(
     config.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    # INSERT executemany is already folded into multi-row VALUES by default;
+    # this also batches the executemany UPDATEs the ORM emits on flush.
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
 )
 
 # Create session factory
@@ -18,10 +26,39 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@contextmanager
+def advisory_lock(key: str):
+    """Try to take a Postgres advisory lock on ``key``; yields whether it was taken.
+
+    The lock is session-level and lives on its own connection, so it is held
+    across the caller's commits and released on exit (or if the connection
+    drops).
+    """
+    conn = engine.connect()
+    locked = False
+    try:
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtextextended(:key, 0))"), {"key": key}
+        ).scalar()
+        conn.commit()
+        yield locked
+    finally:
+        try:
+            if locked:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtextextended(:key, 0))"), {"key": key})
+                conn.commit()
+        finally:
+            conn.close()
+
+
+@contextmanager
 def get_db():
-    """Get database session."""
+    """Yield a database session, rolling back on error and always closing it."""
     db = SessionLocal()
     try:
-        return db
+        yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        pass  # Don't close here, caller is responsible
+        db.close()
@@ -4,20 +4,25 @@ import random
 import time
 import asyncio
 from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
 from typing import List, Optional
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import SessionLocal, advisory_lock, get_db
 from config import config
 from services.github_service import GitHubService
-from services.enrichment_service import EnrichmentService
+from services.enrichment_service import EnrichmentService, close_http_client
 from services.scoring_service import ScoringService
 from models import (
     SourcingJob, JobProgress, CommunitySource, Member,
     MemberActivity, SocialContext, LeadScore,
-    CommunityMember, OrgMember, Project
+    CommunityMember, Project
 )
 import billing_service
+from settings_service import get_user_org_id
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +35,72 @@ logger = logging.getLogger(__name__)
 # Max members to enrich per scan — random sample for broader coverage across runs
 ENRICHMENT_SAMPLE_SIZE = 100
 
+# Contributors upserted per batch (and per commit) during repository sourcing
+SOURCING_BATCH_SIZE = 100
+
+# Stargazers scored per commit (progress is reported at the same cadence)
+STARGAZER_COMMIT_BATCH = 500
+
+# Leads pushed to Clay between cancellation checks / progress commits
+CLAY_PUSH_BATCH_SIZE = 25
+
+# How often running jobs are checked for cancellation
+CANCEL_POLL_SECONDS = 2
+
+# How often queued progress messages are written
+PROGRESS_FLUSH_SECONDS = 0.5
+
+# How long a user's services are reused before settings are re-read
+SERVICES_TTL_SECONDS = 30
+
+# Pooled connections a running job can hold at once (its session plus the
+# source advisory lock), and those the main loop, cancel watcher and
+# progress writer need
+DB_CONNECTIONS_PER_JOB = 2
+DB_CONNECTIONS_RESERVED = 3
+
+# Lead-scoring stats fields and their defaults
+STATS_PAYLOAD_DEFAULTS = (
+    ("total_commits", 0),
+    ("commits_last_3_months", 0),
+    ("pull_requests", 0),
+    ("issues_opened", 0),
+    ("code_reviews", 0),
+    ("is_maintainer", False),
+)
+
+# Payload for members with no activity (stargazers, ingested members).
+# Shared across calls; scoring only reads it.
+EMPTY_STATS_PAYLOAD = dict(STATS_PAYLOAD_DEFAULTS)
+
+# Lead-score columns compared to decide whether a re-score needs a write
+LEAD_SCORE_FIELDS = (
+    "overall_score", "activity_score", "influence_score", "position_score",
+    "engagement_score", "is_qualified_lead", "priority",
+)
+
+# lead_scores score columns are DECIMAL(5, 2)
+SCORE_PLACES = Decimal("0.01")
+
+
+class RateLimiter:
+    """Space out call starts by a fixed interval across concurrent tasks."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval = interval_seconds
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self):
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+            if delay > 0:
+                await asyncio.sleep(delay)
+
 
 class JobCancelledError(Exception):
     """Raised when a job is cancelled while processing."""
@@ -42,6 +113,10 @@ class JobProcessor:
         """Initialize job processor."""
         self.scoring_service = ScoringService()
         self.running_jobs = set()
+        # job_id -> Event set by _watch_cancellations when the job is cancelled
+        self._cancel_events: dict = {}
+        self._pending_progress: dict = {}
+        self._services_cache: dict = {}
 
     def _init_services(self, db: Session, user_id=None):
         """Re-initialize services reading latest settings from DB.
@@ -52,14 +127,27 @@ class JobProcessor:
         """
         self._db = db
         self._user_id = user_id
+        cached = self._services_cache.get(user_id)
+        if cached and cached["expires_at"] > time.monotonic():
+            self.enrichment_service = cached["enrichment"]
+            self._github_service = cached["github"]
+            return
         self._github_service = None
         self.enrichment_service = EnrichmentService(db=db, user_id=user_id)
+        self._services_cache[user_id] = {
+            "expires_at": time.monotonic() + SERVICES_TTL_SECONDS,
+            "enrichment": self.enrichment_service,
+            "github": None,
+        }
 
     @property
     def github_service(self) -> GitHubService:
         """Lazy-init GitHub service; raises ValueError if token missing."""
         if self._github_service is None:
             self._github_service = GitHubService(db=self._db, user_id=self._user_id)
+            cached = self._services_cache.get(self._user_id)
+            if cached is not None:
+                cached["github"] = self._github_service
         return self._github_service
     
     def claim_pending_jobs(self, db: Session) -> List[SourcingJob]:
@@ -68,18 +156,19 @@ class JobProcessor:
         if available == 0:
             return []
 
-        pending_jobs = db.query(SourcingJob).filter(
+        # Lock and flip the oldest pending jobs in one statement
+        claimable = select(SourcingJob.id).where(
             SourcingJob.status == 'pending'
-        ).order_by(SourcingJob.created_at).with_for_update(skip_locked=True).limit(available).all()
-
-        if not pending_jobs:
-            return []
-
-        now = datetime.utcnow()
-        for job in pending_jobs:
-            job.status = 'running'
-            if not job.started_at:
-                job.started_at = now
+        ).order_by(SourcingJob.created_at).with_for_update(skip_locked=True).limit(available)
+        claim = update(SourcingJob).where(
+            SourcingJob.id.in_(claimable.scalar_subquery())
+        ).values(
+            status='running',
+            started_at=func.coalesce(SourcingJob.started_at, datetime.utcnow()),
+        ).returning(SourcingJob).execution_options(synchronize_session=False)
+
+        # RETURNING order is arbitrary; sort before commit expires the rows
+        pending_jobs = sorted(db.scalars(claim).all(), key=lambda job: job.created_at)
         db.commit()
 
         return pending_jobs
@@ -92,7 +181,10 @@ class JobProcessor:
         step_name: str,
         status: str = 'pending'
     ) -> JobProgress:
-        """Create a progress step."""
+        """Create a progress step.
+
+        Only flushed; the following status update commits it.
+        """
         progress = JobProgress(
             job_id=job_id,
             step_number=step_number,
@@ -100,8 +192,7 @@ class JobProcessor:
             status=status
         )
         db.add(progress)
-        db.commit()
-        db.refresh(progress)
+        db.flush()
         return progress
     
     def update_progress_step(
@@ -112,7 +203,15 @@ class JobProcessor:
         message: str = None,
         details: dict = None
     ):
-        """Update a progress step."""
+        """Update a progress step.
+
+        Status transitions are committed so they show up immediately; message
+        updates within the same status are only flushed and ride along with
+        the next commit.
+        """
+        # A direct update supersedes any queued message for this step
+        self._pending_progress.pop(progress.id, None)
+        transition = progress.status != status
         progress.status = status
         if message:
             progress.message = message
@@ -126,7 +225,10 @@ class JobProcessor:
         elif status in ['completed', 'failed']:
             progress.completed_at = datetime.utcnow()
         
-        db.commit()
+        if transition:
+            db.commit()
+        else:
+            db.flush()
     
     def update_job_progress(
         self,
@@ -141,12 +243,80 @@ class JobProcessor:
         job.progress_percentage = (current_step / total_steps * 100) if total_steps > 0 else 0
         db.commit()
 
+    async def run_db(self, fn, *args):
+        """Run a blocking DB call off the event loop.
+
+        The session is still only used by one coroutine at a time; this just
+        lets other jobs' GitHub calls progress while Postgres does the work.
+        """
+        return await asyncio.to_thread(fn, *args)
+
     def ensure_job_active(self, db: Session, job_id: str):
-        """Ensure the job has not been cancelled."""
+        """Ensure the job has not been cancelled.
+
+        Jobs run through process_job are checked against their in-memory
+        cancellation event; anything else falls back to reading the status.
+        """
+        event = self._cancel_events.get(str(job_id))
+        if event is not None:
+            if event.is_set():
+                raise JobCancelledError()
+            return
         status = db.query(SourcingJob.status).filter(SourcingJob.id == job_id).scalar()
         if status == 'cancelled':
             raise JobCancelledError()
 
+    def report_progress(self, progress: JobProgress, message: str):
+        """Queue a message for a running step without touching the job's session.
+
+        Messages are coalesced per step and written by _write_progress, so hot
+        loops don't wait on a commit just to update the UI.
+        """
+        self._pending_progress[progress.id] = message
+
+    async def _write_progress(self):
+        """Periodically flush queued progress messages in one short transaction."""
+        while True:
+            await asyncio.sleep(PROGRESS_FLUSH_SECONDS)
+            if not self._pending_progress:
+                continue
+            updates, self._pending_progress = self._pending_progress, {}
+            try:
+                await asyncio.to_thread(self._flush_progress, updates)
+            except Exception as e:
+                logger.error(f"Error writing job progress: {e}")
+
+    def _flush_progress(self, updates: dict):
+        with get_db() as db:
+            for step_id, message in updates.items():
+                # Only running steps: a step that has since completed or
+                # failed keeps its final message
+                db.query(JobProgress).filter(
+                    JobProgress.id == step_id,
+                    JobProgress.status == 'running',
+                ).update({'message': message}, synchronize_session=False)
+            db.commit()
+
+    async def _watch_cancellations(self):
+        """Poll once for all running jobs and flag the ones that were cancelled."""
+        while True:
+            await asyncio.sleep(CANCEL_POLL_SECONDS)
+            pending = [job_id for job_id, event in self._cancel_events.items() if not event.is_set()]
+            if not pending:
+                continue
+            try:
+                with get_db() as db:
+                    cancelled = db.query(SourcingJob.id).filter(
+                        SourcingJob.id.in_(pending),
+                        SourcingJob.status == 'cancelled'
+                    ).all()
+                for (job_id,) in cancelled:
+                    event = self._cancel_events.get(str(job_id))
+                    if event is not None:
+                        event.set()
+            except Exception as e:
+                logger.error(f"Error checking for cancelled jobs: {e}")
+
     def mark_job_cancelled(self, db: Session, job_id: str):
         """Mark any running/pending steps as failed due to cancellation."""
         steps = db.query(JobProgress).filter(
@@ -163,55 +333,61 @@ class JobProcessor:
 
     def build_stats_payload(self, stats_data: dict) -> dict:
         """Normalize stats data for lead scoring."""
-        return {
-            "total_commits": stats_data.get("total_commits", 0),
-            "commits_last_3_months": stats_data.get("commits_last_3_months", 0),
-            "pull_requests": stats_data.get("pull_requests", 0),
-            "issues_opened": stats_data.get("issues_opened", 0),
-            "code_reviews": stats_data.get("code_reviews", 0),
-            "is_maintainer": stats_data.get("is_maintainer", False)
-        }
+        if not stats_data:
+            return EMPTY_STATS_PAYLOAD
+        get = stats_data.get
+        return {key: get(key, default) for key, default in STATS_PAYLOAD_DEFAULTS}
 
-    def aggregate_stats(self, stats_rows: List[MemberActivity]) -> dict:
-        """Aggregate contributor stats across repositories."""
-        if not stats_rows:
-            return {}
-
-        aggregated = {
-            "total_commits": 0,
-            "commits_last_3_months": 0,
-            "pull_requests": 0,
-            "issues_opened": 0,
-            "code_reviews": 0,
-            "is_maintainer": False
-        }
-
-        for stats in stats_rows:
-            aggregated["total_commits"] += stats.total_commits or 0
-            aggregated["commits_last_3_months"] += stats.commits_last_3_months or 0
-            aggregated["pull_requests"] += stats.pull_requests or 0
-            aggregated["issues_opened"] += stats.issues_opened or 0
-            aggregated["code_reviews"] += stats.code_reviews or 0
-            aggregated["is_maintainer"] = aggregated["is_maintainer"] or bool(stats.is_maintainer)
-
-        return aggregated
+    def prefetch_score_context(
+        self,
+        db: Session,
+        project_id: str,
+        member_ids: List,
+        with_lead_scores: bool = True
+    ) -> dict:
+        """Load everything upsert_lead_score needs for many members up front.
+
+        Returns a context dict (social contexts and lead scores keyed by
+        member_id, plus the project's scoring weights) so per-member scoring
+        does dict lookups instead of three queries each.
+        """
+        scoring_weights = db.query(Project.scoring_weights).filter(
+            Project.id == project_id
+        ).scalar()
+        context = {"social_contexts": {}, "lead_scores": {}, "scoring_weights": scoring_weights}
+        if member_ids:
+            for sc in db.query(SocialContext).filter(SocialContext.member_id.in_(member_ids)):
+                context["social_contexts"].setdefault(sc.member_id, sc)
+        if member_ids and with_lead_scores:
+            for ls in db.query(LeadScore).filter(
+                LeadScore.project_id == project_id,
+                LeadScore.member_id.in_(member_ids)
+            ):
+                context["lead_scores"].setdefault(ls.member_id, ls)
+        return context
 
     def upsert_lead_score(
         self,
         db: Session,
         project_id: str,
         member: Member,
-        stats_data: dict
+        stats_data: dict,
+        context: Optional[dict] = None,
+        social_context: Optional[SocialContext] = None
     ):
-        """Create or update lead scores for a member in a project."""
-        social_context = db.query(SocialContext).filter(
-            SocialContext.member_id == member.id
-        ).first()
+        """Create or update lead scores for a member in a project.
 
-        social_context_data = {
-            "classification": social_context.classification if social_context else None,
-            "position_level": social_context.position_level if social_context else None
-        }
+        Pass a ``context`` from prefetch_score_context to skip the per-member
+        lookups when scoring a batch, or the member's ``social_context`` when
+        the caller already holds it.
+        """
+        if social_context is None:
+            if context is not None:
+                social_context = context["social_contexts"].get(member.id)
+            else:
+                social_context = db.query(SocialContext).filter(
+                    SocialContext.member_id == member.id
+                ).first()
 
         member_data = {
             "followers": member.followers or 0,
@@ -220,20 +396,23 @@ class JobProcessor:
         }
 
         # Get project-specific scoring weights if available
-        project = db.query(Project).filter(Project.id == project_id).first()
-        scoring_weights = project.scoring_weights if project else None
+        if context is not None:
+            scoring_weights = context["scoring_weights"]
+        else:
+            project = db.query(Project).filter(Project.id == project_id).first()
+            scoring_weights = project.scoring_weights if project else None
 
-        score_data = self.scoring_service.calculate_overall_score(
-            member_data,
-            stats_data,
-            social_context_data,
-            scoring_weights=scoring_weights
+        values = self.build_lead_score_values(
+            project_id, member.id, member_data, stats_data, social_context, scoring_weights
         )
 
-        lead_score = db.query(LeadScore).filter(
-            LeadScore.project_id == project_id,
-            LeadScore.member_id == member.id
-        ).first()
+        if context is not None:
+            lead_score = context["lead_scores"].get(member.id)
+        else:
+            lead_score = db.query(LeadScore).filter(
+                LeadScore.project_id == project_id,
+                LeadScore.member_id == member.id
+            ).first()
 
         if not lead_score:
             lead_score = LeadScore(
@@ -241,18 +420,261 @@ class JobProcessor:
                 member_id=member.id
             )
             db.add(lead_score)
+            if context is not None:
+                context["lead_scores"][member.id] = lead_score
+        elif self.lead_score_unchanged(lead_score, values):
+            # Leave the row clean so re-sourcing doesn't rewrite it
+            return
+
+        for field, value in values.items():
+            setattr(lead_score, field, value)
+
+    def lead_score_unchanged(self, lead_score: LeadScore, values: dict) -> bool:
+        """Whether ``values`` would store the same scores already on the row."""
+        for field in LEAD_SCORE_FIELDS:
+            new = values[field]
+            if isinstance(new, Decimal):
+                new = new.quantize(SCORE_PLACES)
+            if getattr(lead_score, field) != new:
+                return False
+        return True
+
+    def build_lead_score_values(
+        self,
+        project_id,
+        member_id,
+        member_data: dict,
+        stats_data: dict,
+        social_context: Optional[SocialContext],
+        scoring_weights: Optional[dict]
+    ) -> dict:
+        """Score a member and return the lead_scores column values."""
+        social_context_data = {
+            "classification": social_context.classification if social_context else None,
+            "position_level": social_context.position_level if social_context else None
+        }
+        score_data = self.scoring_service.calculate_overall_score(
+            member_data,
+            stats_data,
+            social_context_data,
+            scoring_weights=scoring_weights
+        )
+        return {
+            "project_id": project_id,
+            "member_id": member_id,
+            "overall_score": score_data["overall_score"],
+            "activity_score": score_data["activity_score"],
+            "influence_score": score_data["influence_score"],
+            "position_score": score_data["position_score"],
+            "engagement_score": score_data["engagement_score"],
+            "is_qualified_lead": score_data["is_qualified_lead"],
+            "priority": score_data["priority"],
+            "calculated_at": datetime.utcnow(),
+        }
+
+    def write_contributor_batch(self, db: Session, repository: CommunitySource, batch: List[tuple]):
+        """Upsert a contributor batch and commit it."""
+        self.upsert_contributor_batch(db, repository, batch)
+        db.commit()
+
+    def upsert_members(self, db: Session, profiles: List[dict]):
+        """Insert or refresh members from GitHub profile dicts in one statement.
+
+        ``profiles`` must be unique on github_id. Returns rows of
+        ``(id, github_id, followers, public_repos, company)``.
+        """
+        members = Member.__table__
+        insert_members = pg_insert(members).values([
+            {
+                'github_id': c['github_id'],
+                'username': c['username'],
+                'full_name': c['full_name'],
+                'email': c['email'],
+                'company': c['company'],
+                'location': c['location'],
+                'bio': c['bio'],
+                'blog': c['blog'],
+                'twitter_username': c['twitter_username'],
+                'avatar_url': c['avatar_url'],
+                'github_url': c['github_url'],
+                'public_repos': c['public_repos'],
+                'followers': c['followers'],
+                'following': c['following'],
+                'platform_identities': {'github': {'id': c['github_id'], 'url': c['github_url'], 'username': c['username']}},
+            }
+            for c in profiles
+        ])
+        excluded = insert_members.excluded
+
+        def keep_existing(col):
+            # Existing members keep their current values where GitHub returned nothing
+            return func.coalesce(func.nullif(excluded[col], ''), members.c[col])
+
+        return db.execute(
+            insert_members.on_conflict_do_update(
+                index_elements=[members.c.github_id],
+                set_={
+                    'full_name': keep_existing('full_name'),
+                    'email': keep_existing('email'),
+                    'company': keep_existing('company'),
+                    'location': keep_existing('location'),
+                    'bio': keep_existing('bio'),
+                    'followers': excluded.followers,
+                    'public_repos': excluded.public_repos,
+                    'updated_at': func.now(),
+                },
+            ).returning(
+                members.c.id, members.c.github_id, members.c.followers,
+                members.c.public_repos, members.c.company,
+            )
+        ).all()
+
+    def upsert_contributor_batch(self, db: Session, repository: CommunitySource, batch: List[tuple]):
+        """Upsert members, source links, activity and lead scores for a batch.
+
+        ``batch`` is a list of ``(contrib_data, stats_data)`` pairs. Each table
+        is written with one INSERT ... ON CONFLICT statement.
+        """
+        # Deduplicate on github_id: one statement can't update the same row twice
+        by_github_id = {}
+        for contrib_data, stats_data in batch:
+            by_github_id[contrib_data['github_id']] = (contrib_data, stats_data)
+        if not by_github_id:
+            return
+
+        member_rows = self.upsert_members(db, [c for c, _ in by_github_id.values()])
+
+        member_ids = [row.id for row in member_rows]
+        db.execute(
+            pg_insert(CommunityMember.__table__).values([
+                {'source_id': repository.id, 'member_id': member_id} for member_id in member_ids
+            ]).on_conflict_do_nothing(index_elements=['source_id', 'member_id'])
+        )
+
+        now = datetime.utcnow()
+        activity_rows = []
+        score_rows = []
+        score_context = self.prefetch_score_context(
+            db, repository.project_id, member_ids, with_lead_scores=False
+        )
+        for row in member_rows:
+            _, stats_data = by_github_id[row.github_id]
+            activity_rows.append({
+                'source_id': repository.id,
+                'member_id': row.id,
+                'total_commits': stats_data['total_commits'],
+                'commits_last_3_months': stats_data['commits_last_3_months'],
+                'commits_last_6_months': stats_data['commits_last_6_months'],
+                'commits_last_year': stats_data['commits_last_year'],
+                'first_commit_date': stats_data['first_commit_date'],
+                'last_commit_date': stats_data['last_commit_date'],
+                'pull_requests': stats_data['pull_requests'],
+                'issues_opened': stats_data['issues_opened'],
+                'is_maintainer': stats_data['is_maintainer'],
+                'calculated_at': now,
+            })
+            member_data = {
+                "followers": row.followers or 0,
+                "public_repos": row.public_repos or 0,
+                "company": row.company
+            }
+            score_rows.append(self.build_lead_score_values(
+                repository.project_id,
+                row.id,
+                member_data,
+                self.build_stats_payload(stats_data),
+                score_context["social_contexts"].get(row.id),
+                score_context["scoring_weights"],
+            ))
+
+        insert_activity = pg_insert(MemberActivity.__table__).values(activity_rows)
+        db.execute(insert_activity.on_conflict_do_update(
+            index_elements=['source_id', 'member_id'],
+            set_={
+                col: insert_activity.excluded[col]
+                for col in activity_rows[0] if col not in ('source_id', 'member_id')
+            },
+        ))
+
+        self.bulk_upsert_lead_scores(db, score_rows)
+
+    def bulk_upsert_lead_scores(self, db: Session, score_rows: List[dict]):
+        """Upsert build_lead_score_values rows with one INSERT ... ON CONFLICT.
+
+        Rows must be unique on (project_id, member_id).
+        """
+        if not score_rows:
+            return
+        lead_scores = LeadScore.__table__
+        insert_scores = pg_insert(lead_scores).values(score_rows)
+        db.execute(insert_scores.on_conflict_do_update(
+            index_elements=['project_id', 'member_id'],
+            set_={
+                col: insert_scores.excluded[col]
+                for col in score_rows[0] if col not in ('project_id', 'member_id')
+            },
+            # Skip rows whose scores didn't change (calculated_at aside)
+            where=tuple_(*[lead_scores.c[col] for col in LEAD_SCORE_FIELDS]).is_distinct_from(
+                tuple_(*[insert_scores.excluded[col] for col in LEAD_SCORE_FIELDS])
+            ),
+        ))
+
+    def queue_social_enrichment(self, db: Session, source: CommunitySource, created_by) -> tuple:
+        """Queue social_enrichment jobs for a sample of the source's unenriched members.
+
+        Returns ``(queued, total_members, unenriched_count)``. Does not commit.
+        """
+        # Only this source's members are scanned; the anti-join finds those
+        # without social context.
+        unenriched = db.query(CommunityMember.member_id, Member.username).join(
+            Member, Member.id == CommunityMember.member_id
+        ).outerjoin(
+            SocialContext, SocialContext.member_id == CommunityMember.member_id
+        ).filter(
+            CommunityMember.source_id == source.id,
+            SocialContext.id.is_(None)
+        ).all()
+        total_members = db.query(func.count(CommunityMember.id)).filter(
+            CommunityMember.source_id == source.id
+        ).scalar() or 0
+
+        # Random sample for broader coverage across multiple scans
+        if len(unenriched) > ENRICHMENT_SAMPLE_SIZE:
+            sample = random.sample(unenriched, ENRICHMENT_SAMPLE_SIZE)
+            logger.info(f"Sampling {ENRICHMENT_SAMPLE_SIZE} of {len(unenriched)} unenriched members for enrichment")
+        else:
+            sample = unenriched
+
+        if sample:
+            db.execute(insert(SourcingJob.__table__), [
+                {
+                    'project_id': source.project_id,
+                    'source_id': source.id,
+                    'job_type': 'social_enrichment',
+                    'status': 'pending',
+                    'metadata': {'contributor_id': str(member_id), 'username': username or 'unknown'},
+                    'created_by': created_by,
+                }
+                for member_id, username in sample
+            ])
+        return len(sample), total_members, len(unenriched)
 
-        lead_score.overall_score = score_data["overall_score"]
-        lead_score.activity_score = score_data["activity_score"]
-        lead_score.influence_score = score_data["influence_score"]
-        lead_score.position_score = score_data["position_score"]
-        lead_score.engagement_score = score_data["engagement_score"]
-        lead_score.is_qualified_lead = score_data["is_qualified_lead"]
-        lead_score.priority = score_data["priority"]
-        lead_score.calculated_at = datetime.utcnow()
-    
     async def process_repository_sourcing(self, db: Session, job: SourcingJob):
-        """Process repository sourcing job."""
+        """Process repository sourcing job, one at a time per source.
+
+        If another worker already holds the source, the job goes back to
+        pending instead of contending on the same member rows.
+        """
+        with advisory_lock(f"source_sourcing:{job.source_id}") as locked:
+            if not locked:
+                logger.info(f"Source {job.source_id} is busy; requeueing job {job.id}")
+                job.status = 'pending'
+                db.commit()
+                return
+            await self._source_repository(db, job)
+
+    async def _source_repository(self, db: Session, job: SourcingJob):
+        """Run the repository sourcing steps."""
         logger.info(f"Processing repository sourcing job {job.id}")
         
         try:
@@ -318,13 +740,19 @@ class JobProcessor:
                     org_id = project.org_id if project else None
                     fetch_limit = int(get_setting(db, 'CONTRIBUTOR_SCAN_LIMIT', '100', org_id=org_id))
                 logger.info(f"Contributor limit for job {job.id}: {fetch_limit} (sample_size={sample_size})")
-                contributors_data = await asyncio.to_thread(
-                    self.github_service.get_contributors,
+                # Pull contributors a batch at a time; the first batch is read
+                # here so API errors still fail this step.
+                contributor_stream = self.github_service.iter_contributors(
                     repository.owner,
                     repository.repo_name,
                     fetch_limit
                 )
 
+                def next_contributor_batch():
+                    return list(islice(contributor_stream, SOURCING_BATCH_SIZE))
+
+                batch = await asyncio.to_thread(next_contributor_batch)
+
                 bulk_stats = {}
                 if config.USE_BULK_CONTRIBUTOR_STATS:
                     bulk_stats = await asyncio.to_thread(
@@ -335,7 +763,7 @@ class JobProcessor:
                 
                 self.update_progress_step(
                     db, step2, 'completed',
-                    f"Found {len(contributors_data)} contributors"
+                    f"Streaming up to {fetch_limit} contributors"
                 )
             except Exception as e:
                 self.update_progress_step(db, step2, 'failed', str(e))
@@ -348,129 +776,65 @@ class JobProcessor:
             step3 = self.create_progress_step(db, job.id, 3, "Processing contributor statistics")
             self.update_progress_step(db, step3, 'running')
             
-            try:
-                processed_count = 0
-                batch_size = 25
-                for contrib_data in contributors_data:
-                    if processed_count % 10 == 0:
-                        self.ensure_job_active(db, job.id)
-                    # Create or update member
-                    member = db.query(Member).filter(
-                        Member.github_id == contrib_data['github_id']
-                    ).first()
-                    
-                    if not member:
-                        member = Member(
-                            github_id=contrib_data['github_id'],
-                            username=contrib_data['username'],
-                            full_name=contrib_data['full_name'],
-                            email=contrib_data['email'],
-                            company=contrib_data['company'],
-                            location=contrib_data['location'],
-                            bio=contrib_data['bio'],
-                            blog=contrib_data['blog'],
-                            twitter_username=contrib_data['twitter_username'],
-                            avatar_url=contrib_data['avatar_url'],
-                            github_url=contrib_data['github_url'],
-                            public_repos=contrib_data['public_repos'],
-                            followers=contrib_data['followers'],
-                            following=contrib_data['following'],
-                            platform_identities={'github': {'id': contrib_data['github_id'], 'url': contrib_data['github_url'], 'username': contrib_data['username']}}
-                        )
-                        db.add(member)
-                        db.flush()
-                    else:
-                        # Update existing member
-                        member.full_name = contrib_data['full_name'] or member.full_name
-                        member.email = contrib_data['email'] or member.email
-                        member.company = contrib_data['company'] or member.company
-                        member.location = contrib_data['location'] or member.location
-                        member.bio = contrib_data['bio'] or member.bio
-                        member.followers = contrib_data['followers']
-                        member.public_repos = contrib_data['public_repos']
-                    
-                    # Create source-member relationship
-                    community_member = db.query(CommunityMember).filter(
-                        CommunityMember.source_id == repository.id,
-                        CommunityMember.member_id == member.id
-                    ).first()
-                    
-                    if not community_member:
-                        community_member = CommunityMember(
-                            source_id=repository.id,
-                            member_id=member.id
-                        )
-                        db.add(community_member)
-                    
-                    # Get detailed stats
-                    if config.USE_BULK_CONTRIBUTOR_STATS:
-                        stats_data = self.github_service.build_stats_from_bulk(
-                            contrib_data['username'],
-                            contrib_data.get('contributions'),
-                            bulk_stats
-                        )
-                    else:
+            # GitHub calls are network-bound: fan them out, bounded so we stay
+            # within rate limits. DB writes stay on this task.
+            github_sem = asyncio.Semaphore(config.GITHUB_FETCH_CONCURRENCY)
+
+            async def fetch_contributor_stats(contrib_data):
+                if config.USE_BULK_CONTRIBUTOR_STATS:
+                    stats_data = self.github_service.build_stats_from_bulk(
+                        contrib_data['username'],
+                        contrib_data.get('contributions'),
+                        bulk_stats
+                    )
+                else:
+                    async with github_sem:
                         stats_data = await asyncio.to_thread(
                             self.github_service.get_contributor_stats,
                             repository.owner,
                             repository.repo_name,
                             contrib_data['username']
                         )
+                return contrib_data, stats_data
 
+            next_batch = None
+            try:
+                processed_count = 0
+                while batch:
+                    # Page in the next batch while this one is processed.
+                    next_batch = asyncio.create_task(asyncio.to_thread(next_contributor_batch))
+
+                    # Fetch stats for the batch first so the DB writes below
+                    # are a handful of multi-row statements.
+                    self.ensure_job_active(db, job.id)
+                    batch_stats = await asyncio.gather(*[
+                        fetch_contributor_stats(contrib_data) for contrib_data in batch
+                    ])
                     if config.FETCH_PR_ISSUE_COUNTS:
-                        prs, issues = await asyncio.to_thread(
-                            self.github_service.get_pr_issue_counts,
+                        pr_issue_counts = await asyncio.to_thread(
+                            self.github_service.get_pr_issue_counts_bulk,
                             repository.owner,
                             repository.repo_name,
-                            contrib_data['username']
-                        )
-                        stats_data["pull_requests"] = prs
-                        stats_data["issues_opened"] = issues
-                    
-                    # Create or update member activity
-                    stats = db.query(MemberActivity).filter(
-                        MemberActivity.source_id == repository.id,
-                        MemberActivity.member_id == member.id
-                    ).first()
-                    
-                    if not stats:
-                        stats = MemberActivity(
-                            source_id=repository.id,
-                            member_id=member.id
+                            [contrib_data['username'] for contrib_data in batch]
                         )
-                        db.add(stats)
-                    
-                    stats.total_commits = stats_data['total_commits']
-                    stats.commits_last_3_months = stats_data['commits_last_3_months']
-                    stats.commits_last_6_months = stats_data['commits_last_6_months']
-                    stats.commits_last_year = stats_data['commits_last_year']
-                    stats.first_commit_date = stats_data['first_commit_date']
-                    stats.last_commit_date = stats_data['last_commit_date']
-                    stats.pull_requests = stats_data['pull_requests']
-                    stats.issues_opened = stats_data['issues_opened']
-                    stats.is_maintainer = stats_data['is_maintainer']
-                    stats.calculated_at = datetime.utcnow()
-
-                    stats_payload = self.build_stats_payload(stats_data)
-                    self.upsert_lead_score(db, repository.project_id, member, stats_payload)
+                        for contrib_data, stats_data in batch_stats:
+                            prs, issues = pr_issue_counts.get(contrib_data['username'], (0, 0))
+                            stats_data["pull_requests"] = prs
+                            stats_data["issues_opened"] = issues
+                    processed_count += len(batch)
+
+                    await self.run_db(self.write_contributor_batch, db, repository, batch_stats)
+                    self.report_progress(step3, f"Processed {processed_count} contributors")
+                    batch = await next_batch
 
-                    processed_count += 1
-                    
-                    # Update progress
-                    if processed_count % 10 == 0:
-                        self.update_progress_step(
-                            db, step3, 'running',
-                            f"Processed {processed_count}/{len(contributors_data)} contributors"
-                        )
-                    if processed_count % batch_size == 0:
-                        db.commit()
-                
-                db.commit()
                 self.update_progress_step(
                     db, step3, 'completed',
                     f"Processed {processed_count} contributors"
                 )
             except Exception as e:
+                if next_batch is not None:
+                    next_batch.cancel()
+                db.rollback()
                 self.update_progress_step(db, step3, 'failed', str(e))
                 raise
             
@@ -482,39 +846,12 @@ class JobProcessor:
             self.update_progress_step(db, step4, 'running')
 
             try:
-                # Find all members linked to this source that don't have social context yet
-                enriched_ids = {sc.member_id for sc in db.query(SocialContext.member_id).all()}
-                source_members = db.query(CommunityMember).filter(
-                    CommunityMember.source_id == repository.id
-                ).all()
-
-                unenriched = [cm for cm in source_members if cm.member_id not in enriched_ids]
-                # Random sample for broader coverage across multiple scans
-                if len(unenriched) > ENRICHMENT_SAMPLE_SIZE:
-                    sample = random.sample(unenriched, ENRICHMENT_SAMPLE_SIZE)
-                    logger.info(f"Sampling {ENRICHMENT_SAMPLE_SIZE} of {len(unenriched)} unenriched members for enrichment")
-                else:
-                    sample = unenriched
-
-                member_ids = [cm.member_id for cm in sample]
-                member_map = {m.id: m.username for m in db.query(Member).filter(Member.id.in_(member_ids)).all()} if member_ids else {}
-
-                enrich_count = 0
-                for cm in sample:
-                    enrich_job = SourcingJob(
-                        project_id=repository.project_id,
-                        source_id=repository.id,
-                        job_type='social_enrichment',
-                        status='pending',
-                        job_metadata={'contributor_id': str(cm.member_id), 'username': member_map.get(cm.member_id, 'unknown')},
-                        created_by=job.created_by
-                    )
-                    db.add(enrich_job)
-                    enrich_count += 1
-
+                enrich_count, total_members, unenriched_count = self.queue_social_enrichment(
+                    db, repository, job.created_by
+                )
                 db.commit()
-                already_enriched = len(source_members) - len(unenriched)
-                remaining = len(unenriched) - enrich_count
+                already_enriched = total_members - unenriched_count
+                remaining = unenriched_count - enrich_count
                 self.update_progress_step(
                     db, step4, 'completed',
                     f"Queued enrichment for {enrich_count} members ({already_enriched} already enriched, {remaining} remaining for next scan)"
@@ -569,7 +906,7 @@ class JobProcessor:
                 raise Exception("Member not found")
             
             # ── Metering: check credits before enrichment ──
-            org_id = billing_service.get_user_org_id(db, job.created_by)
+            org_id = get_user_org_id(db, job.created_by)
             if org_id:
                 ok, remaining = billing_service.check_and_deduct(
                     db, org_id, job.id, contributor.id
@@ -673,21 +1010,39 @@ class JobProcessor:
                 social_context.classification_reasoning = classification['classification_reasoning']
                 social_context.last_enriched_at = datetime.utcnow()
 
-                project_ids = db.query(CommunitySource.project_id).join(
+                # Aggregate the member's activity per project in SQL; the outer
+                # join keeps linked projects that have no activity rows.
+                project_stats = db.query(
+                    CommunitySource.project_id,
+                    func.coalesce(func.sum(MemberActivity.total_commits), 0),
+                    func.coalesce(func.sum(MemberActivity.commits_last_3_months), 0),
+                    func.coalesce(func.sum(MemberActivity.pull_requests), 0),
+                    func.coalesce(func.sum(MemberActivity.issues_opened), 0),
+                    func.coalesce(func.sum(MemberActivity.code_reviews), 0),
+                    func.coalesce(func.bool_or(MemberActivity.is_maintainer), False),
+                ).join(
                     CommunityMember, CommunityMember.source_id == CommunitySource.id
+                ).outerjoin(
+                    MemberActivity,
+                    (MemberActivity.source_id == CommunitySource.id)
+                    & (MemberActivity.member_id == contributor.id)
                 ).filter(
                     CommunityMember.member_id == contributor.id
-                ).distinct().all()
+                ).group_by(CommunitySource.project_id).all()
 
-                for (project_id,) in project_ids:
-                    stats_rows = db.query(MemberActivity).join(
-                        CommunitySource, MemberActivity.source_id == CommunitySource.id
-                    ).filter(
-                        CommunitySource.project_id == project_id,
-                        MemberActivity.member_id == contributor.id
-                    ).all()
-                    stats_payload = self.aggregate_stats(stats_rows)
-                    self.upsert_lead_score(db, project_id, contributor, stats_payload)
+                for project_id, commits, commits_3m, prs, issues, reviews, is_maintainer in project_stats:
+                    stats_payload = {
+                        "total_commits": int(commits),
+                        "commits_last_3_months": int(commits_3m),
+                        "pull_requests": int(prs),
+                        "issues_opened": int(issues),
+                        "code_reviews": int(reviews),
+                        "is_maintainer": bool(is_maintainer)
+                    }
+                    self.upsert_lead_score(
+                        db, project_id, contributor, stats_payload,
+                        social_context=social_context
+                    )
 
                 db.commit()
 
@@ -780,93 +1135,73 @@ class JobProcessor:
             self.update_progress_step(db, step2, 'running')
 
             try:
-                processed_count = 0
-                for sg_data in stargazers_data:
-                    if processed_count % 10 == 0:
-                        self.ensure_job_active(db, job.id)
-
-                    member = db.query(Member).filter(
-                        Member.github_id == sg_data['github_id']
-                    ).first()
-
-                    if not member:
-                        member = Member(
-                            github_id=sg_data['github_id'],
-                            username=sg_data['username'],
-                            full_name=sg_data['full_name'],
-                            email=sg_data['email'],
-                            company=sg_data['company'],
-                            location=sg_data['location'],
-                            bio=sg_data['bio'],
-                            blog=sg_data['blog'],
-                            twitter_username=sg_data['twitter_username'],
-                            avatar_url=sg_data['avatar_url'],
-                            github_url=sg_data['github_url'],
-                            public_repos=sg_data['public_repos'],
-                            followers=sg_data['followers'],
-                            following=sg_data['following'],
-                            platform_identities={'github': {'id': sg_data['github_id'], 'url': sg_data['github_url'], 'username': sg_data['username']}}
-                        )
-                        db.add(member)
-                        db.flush()
-                    else:
-                        member.full_name = sg_data['full_name'] or member.full_name
-                        member.email = sg_data['email'] or member.email
-                        member.company = sg_data['company'] or member.company
-                        member.bio = sg_data['bio'] or member.bio
-                        member.followers = sg_data['followers']
-                        member.public_repos = sg_data['public_repos']
-
-                    # Create source-member relationship
-                    community_member = db.query(CommunityMember).filter(
-                        CommunityMember.source_id == repository.id,
-                        CommunityMember.member_id == member.id
-                    ).first()
-
-                    if not community_member:
-                        community_member = CommunityMember(
-                            source_id=repository.id,
-                            member_id=member.id
-                        )
-                        db.add(community_member)
+                # Insert or refresh every stargazer in one statement
+                profiles = {sg_data['github_id']: sg_data for sg_data in stargazers_data}
+                members = self.upsert_members(db, list(profiles.values())) if profiles else []
+                member_ids = [m.id for m in members]
+                score_context = self.prefetch_score_context(
+                    db, repository.project_id, member_ids, with_lead_scores=False
+                )
 
-                    # Create member_activity with source='stargazer'
-                    stats = db.query(MemberActivity).filter(
-                        MemberActivity.source_id == repository.id,
-                        MemberActivity.member_id == member.id
-                    ).first()
+                # Link members to the source and record stargazer activity;
+                # existing rows are resolved by ON CONFLICT, not a lookup
+                if member_ids:
+                    now = datetime.utcnow()
+                    db.execute(
+                        pg_insert(CommunityMember.__table__).values([
+                            {'source_id': repository.id, 'member_id': member_id} for member_id in member_ids
+                        ]).on_conflict_do_nothing(index_elements=['source_id', 'member_id'])
+                    )
+                    activity = MemberActivity.__table__
+                    insert_activity = pg_insert(activity).values([
+                        {'source_id': repository.id, 'member_id': member_id, 'source': 'stargazer', 'calculated_at': now}
+                        for member_id in member_ids
+                    ])
+                    db.execute(insert_activity.on_conflict_do_update(
+                        index_elements=['source_id', 'member_id'],
+                        set_={
+                            # Commit activity outranks a star
+                            'source': case(
+                                (activity.c.source == 'commit', activity.c.source),
+                                else_=insert_activity.excluded.source,
+                            ),
+                            'calculated_at': insert_activity.excluded.calculated_at,
+                        },
+                    ))
 
-                    if not stats:
-                        stats = MemberActivity(
-                            source_id=repository.id,
-                            member_id=member.id,
-                            source='stargazer'
-                        )
-                        db.add(stats)
-                    elif stats.source != 'commit':
-                        stats.source = 'stargazer'
+                # Loop invariants
+                project_id = repository.project_id
+                social_contexts = score_context["social_contexts"]
+                scoring_weights = score_context["scoring_weights"]
+                total = len(members)
 
-                    stats.calculated_at = datetime.utcnow()
+                processed_count = 0
+                score_rows = []
+                for member in members:
+                    self.ensure_job_active(db, job.id)
 
                     # Score stargazers — they have no commit activity, so score is influence-heavy
-                    stats_payload = {
-                        "total_commits": 0,
-                        "commits_last_3_months": 0,
-                        "pull_requests": 0,
-                        "issues_opened": 0,
-                        "code_reviews": 0,
-                        "is_maintainer": False
-                    }
-                    self.upsert_lead_score(db, repository.project_id, member, stats_payload)
+                    score_rows.append(self.build_lead_score_values(
+                        project_id,
+                        member.id,
+                        {
+                            "followers": member.followers or 0,
+                            "public_repos": member.public_repos or 0,
+                            "company": member.company
+                        },
+                        EMPTY_STATS_PAYLOAD,
+                        social_contexts.get(member.id),
+                        scoring_weights,
+                    ))
 
                     processed_count += 1
-                    if processed_count % 25 == 0:
-                        self.update_progress_step(
-                            db, step2, 'running',
-                            f"Processed {processed_count}/{len(stargazers_data)} stargazers"
-                        )
+                    if processed_count % STARGAZER_COMMIT_BATCH == 0:
+                        self.bulk_upsert_lead_scores(db, score_rows)
+                        score_rows = []
+                        self.report_progress(step2, f"Processed {processed_count}/{total} stargazers")
                         db.commit()
 
+                self.bulk_upsert_lead_scores(db, score_rows)
                 db.commit()
                 self.update_progress_step(
                     db, step2, 'completed',
@@ -884,36 +1219,10 @@ class JobProcessor:
             self.update_progress_step(db, step3, 'running')
 
             try:
-                enriched_ids = {sc.member_id for sc in db.query(SocialContext.member_id).all()}
-                source_members = db.query(CommunityMember).filter(
-                    CommunityMember.source_id == repository.id
-                ).all()
-
-                unenriched = [cm for cm in source_members if cm.member_id not in enriched_ids]
-                # Random sample for broader coverage across multiple scans
-                if len(unenriched) > ENRICHMENT_SAMPLE_SIZE:
-                    sample = random.sample(unenriched, ENRICHMENT_SAMPLE_SIZE)
-                    logger.info(f"Sampling {ENRICHMENT_SAMPLE_SIZE} of {len(unenriched)} unenriched stargazers for enrichment")
-                else:
-                    sample = unenriched
-
-                member_ids = [cm.member_id for cm in sample]
-                member_map = {m.id: m.username for m in db.query(Member).filter(Member.id.in_(member_ids)).all()} if member_ids else {}
-
-                enrich_count = 0
-                for cm in sample:
-                    enrich_job = SourcingJob(
-                        project_id=repository.project_id,
-                        source_id=repository.id,
-                        job_type='social_enrichment',
-                        status='pending',
-                        job_metadata={'contributor_id': str(cm.member_id), 'username': member_map.get(cm.member_id, 'unknown')},
-                        created_by=job.created_by
-                    )
-                    db.add(enrich_job)
-                    enrich_count += 1
-
-                remaining = len(unenriched) - enrich_count
+                enrich_count, _, unenriched_count = self.queue_social_enrichment(
+                    db, repository, job.created_by
+                )
+                remaining = unenriched_count - enrich_count
                 db.commit()
                 self.update_progress_step(
                     db, step3, 'completed',
@@ -1008,7 +1317,7 @@ class JobProcessor:
             # Connector exists — check if it can actually connect
             # (e.g. token might be missing even though connector code exists)
             try:
-                from settings_service import get_setting, get_user_org_id
+                from settings_service import get_setting
                 org_id = get_user_org_id(db, job.created_by) if job.created_by else None
                 source_config = dict(source.source_config or {})
                 connector = connector_cls(
@@ -1122,8 +1431,7 @@ class JobProcessor:
                 activity.calculated_at = datetime.utcnow()
 
                 # Score
-                stats_payload = self.build_stats_payload({})
-                self.upsert_lead_score(db, source.project_id, member, stats_payload)
+                self.upsert_lead_score(db, source.project_id, member, EMPTY_STATS_PAYLOAD)
 
                 processed_count += 1
                 if processed_count % 25 == 0:
@@ -1133,33 +1441,8 @@ class JobProcessor:
             db.commit()
 
             # Queue enrichment for new members (random sample for broader coverage)
-            enriched_ids = {sc.member_id for sc in db.query(SocialContext.member_id).all()}
-            source_members = db.query(CommunityMember).filter(
-                CommunityMember.source_id == source.id
-            ).all()
-            unenriched = [cm for cm in source_members if cm.member_id not in enriched_ids]
-            if len(unenriched) > ENRICHMENT_SAMPLE_SIZE:
-                sample = random.sample(unenriched, ENRICHMENT_SAMPLE_SIZE)
-                logger.info(f"Sampling {ENRICHMENT_SAMPLE_SIZE} of {len(unenriched)} unenriched members for enrichment")
-            else:
-                sample = unenriched
-
-            member_ids = [cm.member_id for cm in sample]
-            member_map = {m.id: m.username for m in db.query(Member).filter(Member.id.in_(member_ids)).all()} if member_ids else {}
-
-            enrich_count = 0
-            for cm in sample:
-                enrich_job = SourcingJob(
-                    project_id=source.project_id,
-                    source_id=source.id,
-                    job_type='social_enrichment',
-                    status='pending',
-                    job_metadata={'contributor_id': str(cm.member_id), 'username': member_map.get(cm.member_id, 'unknown')},
-                    created_by=job.created_by,
-                )
-                db.add(enrich_job)
-                enrich_count += 1
-            remaining = len(unenriched) - enrich_count
+            enrich_count, _, unenriched_count = self.queue_social_enrichment(db, source, job.created_by)
+            remaining = unenriched_count - enrich_count
             db.commit()
             logger.info(f"Queued {enrich_count} enrichment jobs for source {source.full_name} ({remaining} remaining for next scan)")
 
@@ -1192,7 +1475,6 @@ class JobProcessor:
         and queue a clay_push job for new leads that haven't been pushed yet."""
         from models import ClayPushLog
         from settings_service import get_setting
-        from decimal import Decimal
 
         try:
             project = db.query(Project).filter(Project.id == job.project_id).first()
@@ -1200,11 +1482,7 @@ class JobProcessor:
                 return
 
             # Resolve org
-            org_id = None
-            if job.created_by:
-                org_member = db.query(OrgMember).filter(OrgMember.user_id == job.created_by).first()
-                if org_member:
-                    org_id = org_member.org_id
+            org_id = get_user_org_id(db, job.created_by) if job.created_by else None
 
             # Check Clay is configured
             webhook_url = get_setting(db, 'CLAY_WEBHOOK_URL', org_id=org_id, user_id=job.created_by)
@@ -1212,50 +1490,41 @@ class JobProcessor:
                 logger.info(f"Auto-export skipped for project {project.name}: Clay webhook not configured")
                 return
 
-            # Get all member IDs in this project
-            project_member_ids = db.query(CommunityMember.member_id).join(
+            # Members in this project, minus already-pushed ones (diffed in SQL)
+            new_ids_q = select(CommunityMember.member_id).join(
                 CommunitySource, CommunitySource.id == CommunityMember.source_id
-            ).filter(CommunitySource.project_id == project.id).distinct().all()
-            all_ids = {str(row[0]) for row in project_member_ids}
-
-            if not all_ids:
-                return
-
-            # Exclude already-pushed members
-            already_pushed = set()
+            ).where(CommunitySource.project_id == project.id).distinct()
             if org_id:
-                pushed_rows = db.query(ClayPushLog.member_id).filter(
-                    ClayPushLog.org_id == org_id,
-                    ClayPushLog.project_id == project.id,
-                    ClayPushLog.status == 'success',
-                ).all()
-                already_pushed = {str(row[0]) for row in pushed_rows}
-
-            new_ids = all_ids - already_pushed
+                new_ids_q = new_ids_q.except_(
+                    select(ClayPushLog.member_id).where(
+                        ClayPushLog.org_id == org_id,
+                        ClayPushLog.project_id == project.id,
+                        ClayPushLog.status == 'success',
+                    )
+                )
+            new_ids = {str(row[0]) for row in db.execute(new_ids_q).all()}
             if not new_ids:
                 logger.info(f"Auto-export: no new leads for project {project.name}")
                 return
 
             # Apply filters
             if project.auto_export_clay_min_score or project.auto_export_clay_classifications:
-                filtered_ids = set()
-                for cid in new_ids:
-                    score = db.query(LeadScore).filter(
-                        LeadScore.project_id == project.id,
-                        LeadScore.member_id == cid,
-                    ).first()
-                    if not score:
-                        continue
-                    if project.auto_export_clay_min_score and (score.overall_score or 0) < Decimal(str(project.auto_export_clay_min_score)):
-                        continue
-                    if project.auto_export_clay_classifications:
-                        social = db.query(SocialContext.classification).filter(
-                            SocialContext.member_id == cid
-                        ).first()
-                        if not social or social.classification not in project.auto_export_clay_classifications:
-                            continue
-                    filtered_ids.add(cid)
-                new_ids = filtered_ids
+                # Evaluate both filters in one query over the candidate ids
+                passing = db.query(LeadScore.member_id).filter(
+                    LeadScore.project_id == project.id,
+                    LeadScore.member_id.in_(new_ids),
+                )
+                if project.auto_export_clay_min_score:
+                    passing = passing.filter(
+                        func.coalesce(LeadScore.overall_score, 0) >= Decimal(str(project.auto_export_clay_min_score))
+                    )
+                if project.auto_export_clay_classifications:
+                    passing = passing.join(
+                        SocialContext, SocialContext.member_id == LeadScore.member_id
+                    ).filter(
+                        SocialContext.classification.in_(project.auto_export_clay_classifications)
+                    )
+                new_ids = {str(row[0]) for row in passing.all()}
 
             if not new_ids:
                 logger.info(f"Auto-export: no leads pass filters for project {project.name}")
@@ -1303,11 +1572,7 @@ class JobProcessor:
                 raise Exception("No project ID specified")
 
             # Resolve org
-            org_id = None
-            if job.created_by:
-                org_member = db.query(OrgMember).filter(OrgMember.user_id == job.created_by).first()
-                if org_member:
-                    org_id = org_member.org_id
+            org_id = get_user_org_id(db, job.created_by) if job.created_by else None
 
             # Get Clay webhook URL
             webhook_url = get_setting(db, 'CLAY_WEBHOOK_URL', org_id=org_id, user_id=job.created_by)
@@ -1353,47 +1618,57 @@ class JobProcessor:
             fail_count = 0
             skip_count = 0
 
-            for i, contributor in enumerate(contributors):
-                if i % 5 == 0:
-                    self.ensure_job_active(db, job.id)
+            # Pushes overlap up to CLAY_PUSH_CONCURRENCY; the limiter keeps
+            # their starts rate_limit_ms apart.
+            push_sem = asyncio.Semaphore(config.CLAY_PUSH_CONCURRENCY)
+            limiter = RateLimiter(rate_limit_ms / 1000.0)
 
-                # Build payload
-                payload = build_lead_payload(db, contributor, project)
+            async def push_one(payload):
+                async with push_sem:
+                    await limiter.wait()
+                    return await asyncio.to_thread(
+                        push_lead_to_clay, webhook_url, payload, rate_limit_ms
+                    )
 
-                # Push
-                ok, status_code, error = await asyncio.to_thread(
-                    push_lead_to_clay, webhook_url, payload, rate_limit_ms
-                )
+            pushed = 0
+            for batch_start in range(0, len(contributors), CLAY_PUSH_BATCH_SIZE):
+                self.ensure_job_active(db, job.id)
+                batch = contributors[batch_start:batch_start + CLAY_PUSH_BATCH_SIZE]
+
+                # Payloads read from the session, so build them here on the loop
+                payloads = [build_lead_payload(db, contributor, project) for contributor in batch]
+                results = await asyncio.gather(*[push_one(payload) for payload in payloads])
+
+                log_rows = []
+                for contributor, (ok, status_code, error) in zip(batch, results):
+                    log_rows.append({
+                        'org_id': org_id,
+                        'job_id': job.id,
+                        'member_id': contributor.id,
+                        'project_id': project_id,
+                        'status': 'success' if ok else 'failed',
+                        'error_message': error,
+                        'clay_response_status': status_code,
+                    })
+
+                    if ok:
+                        success_count += 1
+                    else:
+                        fail_count += 1
+                        logger.warning(f"Clay push failed for contributor {contributor.username}: {error}")
 
-                # Log the push
-                log_entry = ClayPushLog(
-                    org_id=org_id,
-                    job_id=job.id,
-                    member_id=contributor.id,
-                    project_id=project_id,
-                    status='success' if ok else 'failed',
-                    error_message=error,
-                    clay_response_status=status_code,
-                )
-                db.add(log_entry)
+                # Log the batch's pushes in one statement and commit them per
+                # batch so the log never lags far behind what was sent
+                db.execute(insert(ClayPushLog), log_rows)
 
-                if ok:
-                    success_count += 1
-                else:
-                    fail_count += 1
-                    logger.warning(f"Clay push failed for contributor {contributor.username}: {error}")
+                db.commit()
 
                 # Update progress
-                if (i + 1) % 5 == 0 or i == len(contributors) - 1:
-                    self.update_progress_step(
-                        db, step2, 'running',
-                        f"Pushed {i + 1}/{len(contributors)} leads ({success_count} ok, {fail_count} failed)"
-                    )
-                    db.commit()
-
-                # Rate limit
-                if rate_limit_ms > 0 and i < len(contributors) - 1:
-                    await asyncio.sleep(rate_limit_ms / 1000.0)
+                pushed += len(batch)
+                self.report_progress(
+                    step2,
+                    f"Pushed {pushed}/{len(contributors)} leads ({success_count} ok, {fail_count} failed)"
+                )
 
             db.commit()
 
@@ -1436,63 +1711,74 @@ class JobProcessor:
     def check_scheduled_sources(self, db: Session):
         """Create jobs for active sources whose next_sourcing_at is due.
         Idempotent: skips sources that already have a pending or running job."""
-        from sqlalchemy import and_, exists
+        from sqlalchemy import exists
 
         now = datetime.utcnow()
-        due_sources = db.query(CommunitySource).filter(
+        # Sources with a pending/running job are excluded in the same query
+        has_active_job = exists().where(
+            SourcingJob.source_id == CommunitySource.id,
+            SourcingJob.status.in_(['pending', 'running']),
+        )
+        due_sources = db.query(
+            CommunitySource.id, CommunitySource.project_id, CommunitySource.source_type,
+            CommunitySource.full_name, CommunitySource.next_sourcing_at,
+        ).filter(
             CommunitySource.is_active == True,
             CommunitySource.next_sourcing_at != None,
             CommunitySource.next_sourcing_at <= now,
+            ~has_active_job,
         ).all()
 
-        created = 0
-        for source in due_sources:
-            # Skip if there's already a pending/running job for this source
-            has_active_job = db.query(SourcingJob).filter(
-                SourcingJob.source_id == source.id,
-                SourcingJob.status.in_(['pending', 'running']),
-            ).first()
-            if has_active_job:
-                continue
+        if not due_sources:
+            return
 
+        rows = []
+        for source in due_sources:
             # Determine job type based on source_type
             job_type = 'source_ingestion' if source.source_type != 'github_repo' else 'repository_sourcing'
-
-            job = SourcingJob(
-                project_id=source.project_id,
-                source_id=source.id,
-                job_type=job_type,
-                status='pending',
-                job_metadata={'triggered_by': 'scheduler'},
-            )
-            db.add(job)
-            created += 1
+            rows.append({
+                'project_id': source.project_id,
+                'source_id': source.id,
+                'job_type': job_type,
+                'status': 'pending',
+                'metadata': {'triggered_by': 'scheduler'},
+            })
             logger.info(f"Scheduled {job_type} job for source {source.full_name} (due: {source.next_sourcing_at})")
 
-        if created:
-            db.commit()
-            logger.info(f"Created {created} scheduled sourcing jobs")
+        db.execute(insert(SourcingJob.__table__), rows)
+        db.commit()
+        logger.info(f"Created {len(rows)} scheduled sourcing jobs")
 
     def recover_orphaned_jobs(self, db: Session):
         """Reset any 'running' jobs back to 'pending' on startup (handles container restarts).
         Note: out_of_credits jobs are NOT recovered — they wait for credits to be added."""
-        orphaned = db.query(SourcingJob).filter(SourcingJob.status == 'running').all()
-        if orphaned:
-            logger.info(f"Recovering {len(orphaned)} orphaned running jobs")
-            for job in orphaned:
-                job.status = 'pending'
-                job.started_at = None
-                job.progress_percentage = 0
-                job.current_step = 0
-                # Clean up old progress steps
-                db.query(JobProgress).filter(JobProgress.job_id == job.id).delete()
-            db.commit()
+        running = select(SourcingJob.id).where(SourcingJob.status == 'running')
+        # Clean up old progress steps, then reset the jobs, in two statements
+        db.execute(
+            delete(JobProgress).where(JobProgress.job_id.in_(running.scalar_subquery())),
+            execution_options={"synchronize_session": False},
+        )
+        recovered = db.execute(
+            update(SourcingJob).where(SourcingJob.status == 'running').values(
+                status='pending',
+                started_at=None,
+                progress_percentage=0,
+                current_step=0,
+            ),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        db.commit()
+        if recovered:
+            logger.info(f"Recovered {recovered} orphaned running jobs")
 
     async def process_job(self, job: SourcingJob):
         """Process a single job."""
-        db = SessionLocal()
+        # Jobs commit progress and batches many times; keep loaded objects
+        # usable across those commits instead of re-SELECTing them each time.
+        db = SessionLocal(expire_on_commit=False)
         try:
             self.running_jobs.add(str(job.id))
+            self._cancel_events[str(job.id)] = asyncio.Event()
 
             # Re-read settings from DB so UI changes take effect
             # Pass the job creator's user_id so org-specific API keys are resolved
@@ -1522,7 +1808,9 @@ class JobProcessor:
         except Exception as e:
             logger.error(f"Error processing job {job.id}: {e}", exc_info=True)
             try:
-                db_job = db.query(SourcingJob).filter(SourcingJob.id == job.id).first()
+                db_job = db.query(SourcingJob).populate_existing().filter(
+                    SourcingJob.id == job.id
+                ).first()
                 if db_job and db_job.status == 'running':
                     db_job.status = 'failed'
                     db_job.error_message = str(e)[:500]
@@ -1533,51 +1821,64 @@ class JobProcessor:
 
         finally:
             self.running_jobs.discard(str(job.id))
+            self._cancel_events.pop(str(job.id), None)
+            self.scoring_service.clear_cache()
             db.close()
     
     async def run(self):
         """Main processing loop."""
         logger.info("Job processor started")
 
+        pool_capacity = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+        pool_needed = config.MAX_CONCURRENT_JOBS * DB_CONNECTIONS_PER_JOB + DB_CONNECTIONS_RESERVED
+        if pool_needed > pool_capacity:
+            logger.warning(
+                f"MAX_CONCURRENT_JOBS={config.MAX_CONCURRENT_JOBS} can use {pool_needed} DB connections "
+                f"but the pool allows {pool_capacity}; raise DB_POOL_SIZE/DB_MAX_OVERFLOW "
+                f"or jobs will wait up to {config.DB_POOL_TIMEOUT}s for a connection"
+            )
+
         # Recover any jobs left in 'running' state from a previous crash/restart
         try:
-            db = SessionLocal()
-            self.recover_orphaned_jobs(db)
-            db.close()
+            with get_db() as db:
+                self.recover_orphaned_jobs(db)
         except Exception as e:
             logger.error(f"Failed to recover orphaned jobs: {e}")
 
-        while True:
-            try:
-                db = SessionLocal()
+        self._cancel_watcher = asyncio.create_task(self._watch_cancellations())
+        self._progress_writer = asyncio.create_task(self._write_progress())
 
-                # Check for sources due for periodic re-scan
+        try:
+            while True:
                 try:
-                    self.check_scheduled_sources(db)
-                except Exception as e:
-                    logger.error(f"Error checking scheduled sources: {e}")
-                
-                # Get pending jobs
-                pending_jobs = self.claim_pending_jobs(db)
-                
-                if pending_jobs:
-                    logger.info(f"Found {len(pending_jobs)} pending jobs")
-                    
-                    # Process jobs concurrently
-                    tasks = [self.process_job(job) for job in pending_jobs]
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                
-                db.close()
-                
-                # Wait before next check
-                await asyncio.sleep(config.CHECK_INTERVAL_SECONDS)
+                    with get_db() as db:
+                        # Check for sources due for periodic re-scan
+                        try:
+                            self.check_scheduled_sources(db)
+                        except Exception as e:
+                            logger.error(f"Error checking scheduled sources: {e}")
+
+                        # Get pending jobs
+                        pending_jobs = self.claim_pending_jobs(db)
+
+                        if pending_jobs:
+                            logger.info(f"Found {len(pending_jobs)} pending jobs")
+
+                            # Process jobs concurrently
+                            tasks = [self.process_job(job) for job in pending_jobs]
+                            await asyncio.gather(*tasks, return_exceptions=True)
+
+                    # Wait before next check
+                    await asyncio.sleep(config.CHECK_INTERVAL_SECONDS)
             
-            except KeyboardInterrupt:
-                logger.info("Shutting down...")
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                await asyncio.sleep(config.CHECK_INTERVAL_SECONDS)
+                except KeyboardInterrupt:
+                    logger.info("Shutting down...")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in main loop: {e}")
+                    await asyncio.sleep(config.CHECK_INTERVAL_SECONDS)
+        finally:
+            await close_http_client()
 
 
 if __name__ == "__main__":
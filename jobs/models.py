@@ -1,6 +1,6 @@
 """Database models for job processor."""
 import uuid
-from sqlalchemy import Column, String, Integer, Boolean, Text, ForeignKey, DECIMAL, JSON, ARRAY
+from sqlalchemy import Column, String, Integer, Boolean, Text, ForeignKey, DECIMAL, JSON, ARRAY, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -129,6 +129,10 @@ class CommunityMember(Base):
     role = Column(String(50), default='contributor')
     discovered_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        UniqueConstraint('source_id', 'member_id', name='unique_source_member'),
+    )
+
 
 class MemberActivity(Base):
     """Member activity metrics."""
@@ -156,13 +160,17 @@ class MemberActivity(Base):
     source = Column(String(50), default='commit')
     calculated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        UniqueConstraint('source_id', 'member_id', name='unique_source_member_activity'),
+    )
+
 
 class SocialContext(Base):
     """Social context for members."""
     __tablename__ = "social_context"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"))
+    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"), unique=True)
     linkedin_url = Column(String(500))
     linkedin_profile_photo_url = Column(String(500))
     linkedin_headline = Column(Text)
@@ -200,6 +208,10 @@ class LeadScore(Base):
     notes = Column(Text)
     calculated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        UniqueConstraint('project_id', 'member_id', name='unique_project_member_score'),
+    )
+
 
 class SourcingJob(Base):
     """Sourcing job tracking."""
@@ -2,8 +2,10 @@
 import asyncio
 import logging
 import json
+import re
 import time
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import httpx
 from openai import AzureOpenAI, OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -17,6 +19,85 @@ _serpapi_lock = asyncio.Lock()
 _serpapi_last_call: float = 0.0
 SERPAPI_MIN_INTERVAL = 2.0  # seconds between SerpAPI calls
 SERPAPI_MAX_RETRIES = 3
+LINKEDIN_LOOKUP_CONCURRENCY = 8  # parallel lookups across deep enrichments
+
+# Concurrent classify_contributor calls are coalesced into one LLM request
+CLASSIFY_BATCH_SIZE = 10
+CLASSIFY_BATCH_WINDOW = 0.2  # seconds to wait for more profiles to join a batch
+CLASSIFY_MAX_TOKENS_PER_PROFILE = 200
+
+
+def _terms_pattern(*terms: str) -> re.Pattern:
+    """One compiled alternation that matches any of the terms as a substring."""
+    return re.compile("|".join(map(re.escape, terms)))
+
+
+# Position-level tiers, checked in order; first match wins
+_POSITION_LEVELS = (
+    ("C-Suite", _terms_pattern('ceo', 'cto', 'cfo', 'coo', 'cmo', 'chief', 'president', 'founder')),
+    ("Director", _terms_pattern('vp', 'vice president', 'director', 'head of')),
+    ("Manager", _terms_pattern('manager', 'lead', 'principal')),
+    ("Senior", _terms_pattern('senior', 'sr.', 'staff')),
+    ("Mid", _terms_pattern('engineer', 'developer', 'architect', 'analyst')),
+)
+_DECISION_MAKER_TERMS = _terms_pattern(
+    'ceo', 'cto', 'cfo', 'coo', 'vp', 'vice president', 'director', 'head of', 'chief'
+)
+
+
+CLASSIFY_SYSTEM_PROMPT = (
+    "You are an expert at analyzing professional profiles and classifying "
+    "leads for B2B sales. Return only valid JSON."
+)
+
+# One keep-alive client for SerpAPI so searches reuse the TLS connection
+# instead of handshaking per call; created lazily on the running loop.
+_serpapi_http: Optional[httpx.AsyncClient] = None
+
+
+def _serpapi_client() -> httpx.AsyncClient:
+    global _serpapi_http
+    if _serpapi_http is None or _serpapi_http.is_closed:
+        _serpapi_http = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+        )
+    return _serpapi_http
+
+
+async def close_http_client() -> None:
+    """Close the shared SerpAPI client (call on worker shutdown)."""
+    global _serpapi_http
+    if _serpapi_http is not None:
+        await _serpapi_http.aclose()
+        _serpapi_http = None
+
+_SETTING_KEYS = (
+    'SERPER_API_KEY',
+    'AZURE_OPENAI_API_KEY',
+    'AZURE_OPENAI_ENDPOINT',
+    'AZURE_OPENAI_DEPLOYMENT',
+    'AZURE_OPENAI_API_VERSION',
+    'OPENAI_API_KEY',
+    'OPENAI_MODEL',
+)
+_SETTING_DEFAULTS = {
+    'AZURE_OPENAI_DEPLOYMENT': 'gpt-4o-mini',
+    'AZURE_OPENAI_API_VERSION': '2024-02-15-preview',
+    'OPENAI_MODEL': 'gpt-4-turbo-preview',
+}
+
+
+# OpenAI clients hold an HTTP connection pool; share one per credential set
+# across jobs rather than building a new one every time settings are read.
+@lru_cache(maxsize=32)
+def _azure_openai_client(api_key: str, api_version: str, azure_endpoint: str) -> AzureOpenAI:
+    return AzureOpenAI(api_key=api_key, api_version=api_version, azure_endpoint=azure_endpoint)
+
+
+@lru_cache(maxsize=32)
+def _openai_client(api_key: str) -> OpenAI:
+    return OpenAI(api_key=api_key)
 
 
 class EnrichmentService:
@@ -25,15 +106,16 @@ class EnrichmentService:
     def __init__(self, db=None, user_id=None):
         """Initialize enrichment service."""
         if db:
-            from settings_service import get_setting, get_user_org_id
+            from settings_service import get_settings, get_user_org_id
             org_id = get_user_org_id(db, user_id) if user_id else None
-            serper_key = get_setting(db, 'SERPER_API_KEY', org_id=org_id)
-            azure_key = get_setting(db, 'AZURE_OPENAI_API_KEY', org_id=org_id)
-            azure_endpoint = get_setting(db, 'AZURE_OPENAI_ENDPOINT', org_id=org_id)
-            azure_deployment = get_setting(db, 'AZURE_OPENAI_DEPLOYMENT', 'gpt-4o-mini', org_id=org_id)
-            azure_api_version = get_setting(db, 'AZURE_OPENAI_API_VERSION', '2024-02-15-preview', org_id=org_id)
-            openai_key = get_setting(db, 'OPENAI_API_KEY', org_id=org_id)
-            openai_model = get_setting(db, 'OPENAI_MODEL', 'gpt-4-turbo-preview', org_id=org_id)
+            settings = get_settings(db, _SETTING_KEYS, _SETTING_DEFAULTS, org_id=org_id)
+            serper_key = settings['SERPER_API_KEY']
+            azure_key = settings['AZURE_OPENAI_API_KEY']
+            azure_endpoint = settings['AZURE_OPENAI_ENDPOINT']
+            azure_deployment = settings['AZURE_OPENAI_DEPLOYMENT']
+            azure_api_version = settings['AZURE_OPENAI_API_VERSION']
+            openai_key = settings['OPENAI_API_KEY']
+            openai_model = settings['OPENAI_MODEL']
         else:
             serper_key = config.SERPER_API_KEY
             azure_key = config.AZURE_OPENAI_API_KEY
@@ -47,22 +129,25 @@ class EnrichmentService:
         
         # Initialize OpenAI client (Azure preferred if configured)
         if azure_key and azure_endpoint:
-            self.openai_client = AzureOpenAI(
-                api_key=azure_key,
-                api_version=azure_api_version,
-                azure_endpoint=azure_endpoint
-            )
+            self.openai_client = _azure_openai_client(azure_key, azure_api_version, azure_endpoint)
             self.openai_model = azure_deployment
         elif openai_key:
-            self.openai_client = OpenAI(
-                api_key=openai_key
-            )
+            self.openai_client = _openai_client(openai_key)
             self.openai_model = openai_model
         else:
             self.openai_client = None
             self.openai_model = None
             
         self.linkedin_service = linkedin_service
+        self._lookup_sem = asyncio.Semaphore(LINKEDIN_LOOKUP_CONCURRENCY)
+        self._classify_pending: List[Tuple[tuple, asyncio.Future]] = []
+        self._classify_flush: Optional[asyncio.TimerHandle] = None
+        self._classify_tasks: set = set()
+
+    async def _limited(self, coro):
+        """Await a LinkedIn lookup under the shared concurrency limit."""
+        async with self._lookup_sem:
+            return await coro
     
     async def search_person(self, name: str, company: Optional[str] = None, username: Optional[str] = None) -> Dict[str, Any]:
         """Search for a person on the web (LinkedIn, etc.) using SerpAPI."""
@@ -89,19 +174,17 @@ class EnrichmentService:
                     if elapsed < SERPAPI_MIN_INTERVAL:
                         await asyncio.sleep(SERPAPI_MIN_INTERVAL - elapsed)
 
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(
-                            "https://serpapi.com/search",
-                            params={
-                                "q": query,
-                                "api_key": self.serpapi_key,
-                                "engine": "google",
-                                "num": 5
-                            },
-                            timeout=30.0,
-                        )
-                        _serpapi_last_call = time.monotonic()
-                        response.raise_for_status()
+                    response = await _serpapi_client().get(
+                        "https://serpapi.com/search",
+                        params={
+                            "q": query,
+                            "api_key": self.serpapi_key,
+                            "engine": "google",
+                            "num": 5
+                        },
+                    )
+                    _serpapi_last_call = time.monotonic()
+                    response.raise_for_status()
 
                     data = response.json()
                     # SerpAPI uses "organic_results" with "title", "link", "snippet", "thumbnail"
@@ -185,26 +268,9 @@ class EnrichmentService:
             return "Unknown"
         
         position_lower = position.lower()
-        
-        # C-Suite
-        if any(term in position_lower for term in ['ceo', 'cto', 'cfo', 'coo', 'cmo', 'chief', 'president', 'founder']):
-            return "C-Suite"
-        
-        # VP/Director
-        if any(term in position_lower for term in ['vp', 'vice president', 'director', 'head of']):
-            return "Director"
-        
-        # Manager
-        if any(term in position_lower for term in ['manager', 'lead', 'principal']):
-            return "Manager"
-        
-        # Senior
-        if any(term in position_lower for term in ['senior', 'sr.', 'staff']):
-            return "Senior"
-        
-        # Mid-level
-        if any(term in position_lower for term in ['engineer', 'developer', 'architect', 'analyst']):
-            return "Mid"
+        for level, pattern in _POSITION_LEVELS:
+            if pattern.search(position_lower):
+                return level
         
         return "Entry"
     
@@ -214,57 +280,100 @@ class EnrichmentService:
         stats_data: Dict[str, Any],
         linkedin_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Classify contributor using LLM."""
+        """Classify contributor using LLM.
+
+        Calls made close together (e.g. from concurrent enrichment jobs) are
+        sent as one batched request via classify_contributors_batch.
+        """
         if not self.openai_client:
             # Fallback to rule-based classification
             return self._rule_based_classification(contributor_data, stats_data, linkedin_data)
-        
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._classify_pending.append(((contributor_data, stats_data, linkedin_data), future))
+        if len(self._classify_pending) >= CLASSIFY_BATCH_SIZE:
+            self._flush_classify()
+        elif self._classify_flush is None:
+            self._classify_flush = loop.call_later(CLASSIFY_BATCH_WINDOW, self._flush_classify)
+        return await future
+
+    def _flush_classify(self):
+        """Send the queued classify_contributor calls as one batch."""
+        if self._classify_flush is not None:
+            self._classify_flush.cancel()
+            self._classify_flush = None
+        pending, self._classify_pending = self._classify_pending, []
+        if pending:
+            task = asyncio.create_task(self._resolve_classify_batch(pending))
+            self._classify_tasks.add(task)
+            task.add_done_callback(self._classify_tasks.discard)
+
+    async def _resolve_classify_batch(self, pending: List[Tuple[tuple, asyncio.Future]]):
+        items = [args for args, _ in pending]
+        try:
+            results = await self.classify_contributors_batch(items)
+        except Exception as e:
+            logger.error(f"Error in batched LLM classification: {e}")
+            results = [self._rule_based_classification(*item) for item in items]
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def classify_contributors_batch(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Classify several contributors with a single LLM request.
+
+        Each item is a (contributor_data, stats_data, linkedin_data) tuple.
+        Profiles the model doesn't return fall back to rule-based classification.
+        """
+        if not items:
+            return []
+        if not self.openai_client:
+            return [self._rule_based_classification(*item) for item in items]
+
         try:
-            # Build context for LLM
+            profiles = "\n".join(
+                f"Profile id {idx}:\n{self._classification_profile(*item)}"
+                for idx, item in enumerate(items)
+            )
             context = f"""
-            Contributor Information:
-            - Name: {contributor_data.get('full_name', 'Unknown')}
-            - Username: {contributor_data.get('username')}
-            - Company: {contributor_data.get('company', 'Unknown')}
-            - Bio: {contributor_data.get('bio', 'N/A')}
-            - GitHub Followers: {contributor_data.get('followers', 0)}
-            
-            Activity Stats:
-            - Total Commits: {stats_data.get('total_commits', 0)}
-            - Commits (Last 3 months): {stats_data.get('commits_last_3_months', 0)}
-            - Pull Requests: {stats_data.get('pull_requests', 0)}
-            - Is Maintainer: {stats_data.get('is_maintainer', False)}
+            {profiles}
             
-            Professional Profile:
-            - Current Position: {linkedin_data.get('current_position', 'Unknown')}
-            - Current Company: {linkedin_data.get('current_company', 'Unknown')}
-            - LinkedIn Headline: {linkedin_data.get('linkedin_headline', 'N/A')}
+            For each profile above:
             
-            Based on this information:
-            
-            1. Classify this contributor into one of these categories:
+            1. Classify the contributor into one of these categories:
                - DECISION_MAKER: C-suite, VPs, Directors who can make purchasing decisions
                - KEY_CONTRIBUTOR: Maintainers, core team members, architects with high influence
                - HIGH_IMPACT: Active contributors with significant recent activity
             
             2. Infer their organization and industry from all available signals (company field, bio, repos, LinkedIn).
             
-            Return ONLY a JSON object with these fields:
+            Return ONLY a JSON object with one entry per profile, in this shape:
             {{
-                "classification": "DECISION_MAKER|KEY_CONTRIBUTOR|HIGH_IMPACT",
-                "confidence": 0.0-1.0,
-                "reasoning": "Brief explanation of why this classification was chosen",
-                "organization": "Best guess at current employer/org or null",
-                "industry": "Industry sector (e.g. Cybersecurity, Cloud Infrastructure, FinTech, Healthcare, etc.) or null"
+                "results": [
+                    {{
+                        "id": <profile id>,
+                        "classification": "DECISION_MAKER|KEY_CONTRIBUTOR|HIGH_IMPACT",
+                        "confidence": 0.0-1.0,
+                        "reasoning": "Brief explanation of why this classification was chosen",
+                        "organization": "Best guess at current employer/org or null",
+                        "industry": "Industry sector (e.g. Cybersecurity, Cloud Infrastructure, FinTech, Healthcare, etc.) or null"
+                    }}
+                ]
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
+            # The OpenAI client is synchronous; keep the event loop free
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model=self.openai_model,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert at analyzing professional profiles and classifying leads for B2B sales. Return only valid JSON."
+                        "content": CLASSIFY_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -272,31 +381,66 @@ class EnrichmentService:
                     }
                 ],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=CLASSIFY_MAX_TOKENS_PER_PROFILE * len(items),
+                # JSON mode: the reply is a bare JSON object, no markdown fences
+                response_format={"type": "json_object"}
             )
             
-            result_text = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            # Remove markdown code blocks if present
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-            
-            result = json.loads(result_text)
-            
-            return {
-                "classification": result.get("classification", "HIGH_IMPACT"),
-                "classification_confidence": min(max(result.get("confidence", 0.5), 0.0), 1.0),
-                "classification_reasoning": result.get("reasoning", ""),
-                "organization": result.get("organization"),
-                "industry": result.get("industry")
-            }
-        
+            by_id = {}
+            for entry in json.loads(response.choices[0].message.content).get("results", []):
+                try:
+                    by_id[int(entry["id"])] = entry
+                except (KeyError, TypeError, ValueError):
+                    continue
         except Exception as e:
             logger.error(f"Error in LLM classification: {e}")
-            return self._rule_based_classification(contributor_data, stats_data, linkedin_data)
+            by_id = {}
+
+        results = []
+        for idx, item in enumerate(items):
+            entry = by_id.get(idx)
+            try:
+                if not isinstance(entry, dict):
+                    raise ValueError(f"no usable result for profile {idx}")
+                results.append({
+                    "classification": entry.get("classification") or "HIGH_IMPACT",
+                    "classification_confidence": min(max(float(entry.get("confidence", 0.5)), 0.0), 1.0),
+                    "classification_reasoning": entry.get("reasoning") or "",
+                    "organization": entry.get("organization"),
+                    "industry": entry.get("industry")
+                })
+            except (TypeError, ValueError) as e:
+                if entry is not None:
+                    logger.warning(f"Malformed LLM classification entry: {e}")
+                results.append(self._rule_based_classification(*item))
+        return results
+
+    def _classification_profile(
+        self,
+        contributor_data: Dict[str, Any],
+        stats_data: Dict[str, Any],
+        linkedin_data: Dict[str, Any]
+    ) -> str:
+        """Render one contributor's signals for the classification prompt."""
+        return f"""
+            Contributor Information:
+            - Name: {contributor_data.get('full_name', 'Unknown')}
+            - Username: {contributor_data.get('username')}
+            - Company: {contributor_data.get('company', 'Unknown')}
+            - Bio: {contributor_data.get('bio', 'N/A')}
+            - GitHub Followers: {contributor_data.get('followers', 0)}
+            
+            Activity Stats:
+            - Total Commits: {stats_data.get('total_commits', 0)}
+            - Commits (Last 3 months): {stats_data.get('commits_last_3_months', 0)}
+            - Pull Requests: {stats_data.get('pull_requests', 0)}
+            - Is Maintainer: {stats_data.get('is_maintainer', False)}
+            
+            Professional Profile:
+            - Current Position: {linkedin_data.get('current_position', 'Unknown')}
+            - Current Company: {linkedin_data.get('current_company', 'Unknown')}
+            - LinkedIn Headline: {linkedin_data.get('linkedin_headline', 'N/A')}
+            """
     
     def _rule_based_classification(
         self,
@@ -309,8 +453,7 @@ class EnrichmentService:
         position_lower = position.lower()
         
         # Check for decision maker indicators
-        decision_maker_terms = ['ceo', 'cto', 'cfo', 'coo', 'vp', 'vice president', 'director', 'head of', 'chief']
-        if any(term in position_lower for term in decision_maker_terms):
+        if _DECISION_MAKER_TERMS.search(position_lower):
             return {
                 "classification": "DECISION_MAKER",
                 "classification_confidence": 0.8,
@@ -386,34 +529,38 @@ class EnrichmentService:
         
         enriched['linkedin_data'] = linkedin_data
         
-        # Step 2: Analyze professional network (if LinkedIn found)
-        if linkedin_data.get('linkedin_url'):
-            network_analysis = await self.linkedin_service.analyze_professional_network(
-                linkedin_data['linkedin_url']
-            )
-            enriched['network_analysis'] = network_analysis
-            
+        # Steps 2-5 only depend on the LinkedIn result, so run them together
+        lookups = {}
+        linkedin_url = linkedin_data.get('linkedin_url')
+        if linkedin_url:
+            # Step 2: Analyze professional network
+            lookups['network_analysis'] = self.linkedin_service.analyze_professional_network(linkedin_url)
             # Step 3: Career trajectory analysis
-            career_analysis = await self.linkedin_service.analyze_career_trajectory(
-                linkedin_data['linkedin_url']
-            )
-            enriched['career_analysis'] = career_analysis
-        
+            lookups['career_analysis'] = self.linkedin_service.analyze_career_trajectory(linkedin_url)
+
         # Step 4: Find contact information
         if contributor_data.get('full_name'):
-            contacts = await self.linkedin_service.find_contact_information(
+            lookups['contact_info'] = self.linkedin_service.find_contact_information(
                 name=contributor_data['full_name'],
                 company=linkedin_data.get('current_company'),
-                linkedin_url=linkedin_data.get('linkedin_url')
+                linkedin_url=linkedin_url
             )
-            enriched['contact_info'] = contacts
-        
+
         # Step 5: Company intelligence
         if linkedin_data.get('current_company'):
-            company_intel = await self.linkedin_service.get_company_intelligence(
+            lookups['company_intelligence'] = self.linkedin_service.get_company_intelligence(
                 linkedin_data['current_company']
             )
-            enriched['company_intelligence'] = company_intel
+
+        results = await asyncio.gather(
+            *(self._limited(coro) for coro in lookups.values()),
+            return_exceptions=True,
+        )
+        for key, result in zip(lookups, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Deep enrichment {key} lookup failed: {result}")
+                continue
+            enriched[key] = result
         
         # Step 6: Calculate enrichment quality score
         enriched['enrichment_quality'] = self._calculate_enrichment_quality(enriched)
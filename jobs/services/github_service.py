@@ -1,13 +1,35 @@
 """GitHub API service."""
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import httpx
 from github import Github, GithubException
 from tenacity import retry, stop_after_attempt, wait_exponential
 from config import config
 
 logger = logging.getLogger(__name__)
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+
+# Clients are cached per token so every job for the same org reuses the
+# same pooled connections instead of reconnecting to GitHub.
+@lru_cache(maxsize=32)
+def _rest_client(token: str) -> Github:
+    return Github(token)
+
+
+@lru_cache(maxsize=32)
+def _graphql_client(token: str) -> httpx.Client:
+    return httpx.Client(
+        timeout=30.0,
+        headers={"Authorization": f"bearer {token}"},
+        limits=httpx.Limits(max_keepalive_connections=config.GITHUB_FETCH_CONCURRENCY),
+    )
+
 
 class GitHubService:
     """Service for interacting with GitHub API."""
@@ -22,7 +44,7 @@ class GitHubService:
         if not self.token:
             raise ValueError("GitHub token is required")
         
-        self.client = Github(self.token)
+        self.client = _rest_client(self.token)
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
@@ -49,9 +71,16 @@ class GitHubService:
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def get_contributors(self, owner: str, repo: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get repository contributors."""
+        return list(self.iter_contributors(owner, repo, limit))
+
+    def iter_contributors(self, owner: str, repo: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield repository contributors as GitHub pages them in.
+
+        Callers can start processing the first contributors while later pages
+        (and profile lookups) are still outstanding.
+        """
         try:
             repo_obj = self.client.get_repo(f"{owner}/{repo}")
-            contributors = []
 
             detailed_limit = limit if config.FETCH_DETAILED_CONTRIBUTOR_PROFILES else config.DETAILED_PROFILE_LIMIT
 
@@ -99,12 +128,10 @@ class GitHubService:
                             "following": user.following,
                         })
 
-                    contributors.append(base)
+                    yield base
                 except Exception as e:
                     logger.warning(f"Error fetching contributor {contributor.login}: {e}")
                     continue
-            
-            return contributors
         except GithubException as e:
             logger.error(f"Error fetching contributors for {owner}/{repo}: {e}")
             raise
@@ -149,10 +176,9 @@ class GitHubService:
                     if commit_date >= six_months_ago:
                         commits_last_6_months += 1
 
+            # PR/issue counts are filled in by get_pr_issue_counts_bulk
             pulls_count = 0
             issues_opened = 0
-            if config.FETCH_PR_ISSUE_COUNTS:
-                pulls_count, issues_opened = self.get_pr_issue_counts(owner, repo, username)
 
             is_maintainer = False
             
@@ -194,6 +220,37 @@ class GitHubService:
             logger.warning(f"Error fetching PR/issue counts for {username}: {e}")
             return 0, 0
 
+    def get_pr_issue_counts_bulk(
+        self, owner: str, repo: str, usernames: List[str], page_size: int = 25
+    ) -> Dict[str, tuple]:
+        """Get PR and issue counts for many users via aliased GraphQL searches.
+
+        Each request carries two aliased ``search`` fields per user, so a page
+        of 25 users is one round trip instead of 50 REST searches. Users on a
+        page that fails are left out of the result.
+        """
+        counts: Dict[str, tuple] = {}
+        client = _graphql_client(self.token)
+        for start in range(0, len(usernames), page_size):
+            page = usernames[start:start + page_size]
+            fields = []
+            for idx, username in enumerate(page):
+                for kind, prefix in (("pr", "p"), ("issue", "i")):
+                    query = json.dumps(f"repo:{owner}/{repo} type:{kind} author:{username}")
+                    fields.append(f"{prefix}{idx}: search(query: {query}, type: ISSUE, first: 0) {{ issueCount }}")
+            try:
+                resp = client.post(GITHUB_GRAPHQL_URL, json={"query": "query { " + " ".join(fields) + " }"})
+                resp.raise_for_status()
+                data = resp.json().get("data") or {}
+            except Exception as e:
+                logger.warning(f"Error fetching PR/issue counts for {owner}/{repo}: {e}")
+                continue
+            for idx, username in enumerate(page):
+                prs = (data.get(f"p{idx}") or {}).get("issueCount", 0)
+                issues = (data.get(f"i{idx}") or {}).get("issueCount", 0)
+                counts[username] = (prs, issues)
+        return counts
+
     def get_contributor_stats_bulk(self, owner: str, repo: str) -> Dict[str, Dict[str, Any]]:
         """Get contributor stats for a repository in a single call."""
         try:
@@ -319,15 +376,13 @@ class GitHubService:
         """Get users who starred a repository with detailed profiles."""
         try:
             repo_obj = self.client.get_repo(f"{owner}/{repo}")
-            stargazers = []
+            logins = [user.login for user in repo_obj.get_stargazers()[:limit]]
 
-            for idx, user in enumerate(repo_obj.get_stargazers()):
-                if idx >= limit:
-                    break
+            def fetch_profile(login: str) -> Optional[Dict[str, Any]]:
                 try:
                     # Fetch detailed profile for richer data
-                    detailed = self.client.get_user(user.login)
-                    stargazers.append({
+                    detailed = self.client.get_user(login)
+                    return {
                         "github_id": detailed.id,
                         "username": detailed.login,
                         "full_name": detailed.name,
@@ -343,10 +398,14 @@ class GitHubService:
                         "followers": detailed.followers,
                         "following": detailed.following,
                         "contributions": 0
-                    })
+                    }
                 except Exception as e:
-                    logger.warning(f"Error fetching stargazer {user.login}: {e}")
-                    continue
+                    logger.warning(f"Error fetching stargazer {login}: {e}")
+                    return None
+
+            # Profile lookups are independent round trips; run a bounded number at once
+            with ThreadPoolExecutor(max_workers=config.GITHUB_FETCH_CONCURRENCY) as pool:
+                stargazers = [p for p in pool.map(fetch_profile, logins) if p]
 
             return stargazers
         except GithubException as e:
@@ -367,7 +426,7 @@ class GitHubService:
                     "stars": repo.stargazers_count,
                     "forks": repo.forks_count,
                     "language": repo.language,
-                    "topics": repo.get_topics(),
+                    "topics": repo.topics or [],
                     "url": repo.html_url
                 })
             
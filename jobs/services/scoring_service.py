@@ -1,13 +1,51 @@
 """Lead scoring service."""
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Distinct scoring inputs kept per worker; cleared at job boundaries.
+SCORE_CACHE_SIZE = 4096
+
+_MEMBER_KEYS = ('followers', 'public_repos')
+_STATS_KEYS = (
+    'total_commits', 'commits_last_3_months', 'pull_requests',
+    'issues_opened', 'code_reviews', 'is_maintainer',
+)
+_SOCIAL_KEYS = ('classification', 'position_level')
+
 
 class ScoringService:
     """Service for calculating lead scores."""
+
+    def __init__(self):
+        self._component_scores = lru_cache(maxsize=SCORE_CACHE_SIZE)(self._compute_component_scores)
+
+    def clear_cache(self):
+        """Drop memoized component scores."""
+        self._component_scores.cache_clear()
+
+    def _compute_component_scores(
+        self,
+        member_values: tuple,
+        has_company: bool,
+        stats_values: tuple,
+        social_values: tuple
+    ) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+        """Score flattened inputs. Missing (None) values fall back to each
+        calculator's own default."""
+        member = {k: v for k, v in zip(_MEMBER_KEYS, member_values) if v is not None}
+        member['company'] = has_company
+        stats = {k: v for k, v in zip(_STATS_KEYS, stats_values) if v is not None}
+        social_context = {k: v for k, v in zip(_SOCIAL_KEYS, social_values) if v is not None}
+        return (
+            self.calculate_activity_score(stats),
+            self.calculate_influence_score(member),
+            self.calculate_position_score(social_context),
+            self.calculate_engagement_score(stats),
+        )
     
     def calculate_activity_score(self, stats: Dict[str, Any]) -> Decimal:
         """Calculate activity score based on contribution stats."""
@@ -173,11 +211,14 @@ class ScoringService:
                              Keys: position, activity, influence, engagement (0-1 each).
         """
         
-        # Calculate individual scores
-        activity_score = self.calculate_activity_score(stats)
-        influence_score = self.calculate_influence_score(member)
-        position_score = self.calculate_position_score(social_context)
-        engagement_score = self.calculate_engagement_score(stats)
+        # Calculate individual scores; members with the same inputs share
+        # one cached result
+        activity_score, influence_score, position_score, engagement_score = self._component_scores(
+            tuple(member.get(k) for k in _MEMBER_KEYS),
+            bool(member.get('company')),
+            tuple(stats.get(k) for k in _STATS_KEYS),
+            tuple(social_context.get(k) for k in _SOCIAL_KEYS),
+        )
         
         # Use project-specific weights or defaults
         if scoring_weights:
@@ -6,12 +6,31 @@ Org-aware: when an org_id is provided the lookup chain is:
 import os
 import logging
 from uuid import UUID
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from sqlalchemy.orm import Session
 from models import AppSetting, OrgSetting, OrgMember
+from cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Settings and org memberships are read by every job; keep them briefly so
+# concurrent jobs for the same org share one lookup. The TTL bounds how long
+# a change made in the UI takes to reach the worker.
+_setting_cache = TTLCache(maxsize=10_000, ttl=60)
+_org_cache = TTLCache(maxsize=10_000, ttl=60)
+_MISSING = object()
+
+# Env vars don't change at runtime; read each one once per process.
+_env_cache: dict[str, Optional[str]] = {}
+
+
+def _cached_env(key: str) -> Optional[str]:
+    """Return os.environ[key] (or None), memoized for the process lifetime."""
+    try:
+        return _env_cache[key]
+    except KeyError:
+        return _env_cache.setdefault(key, os.environ.get(key))
+
 
 def get_setting(db: Session, key: str, default: str = "", *, org_id: Optional[UUID] = None, user_id: Optional[UUID] = None) -> str:
     """Get a setting value.
@@ -22,36 +41,124 @@ def get_setting(db: Session, key: str, default: str = "", *, org_id: Optional[UU
       3. Environment variable
       4. default
     """
+    cache_key = (str(org_id) if org_id else None, key)
+    value = _setting_cache.get(cache_key, _MISSING)
+    if value is _MISSING:
+        value = _read_db_setting(db, key, org_id)
+    if value:
+        return value
+
+    # 3. Env var / default
+    return _cached_env(key) or default
+
+
+def get_settings(
+    db: Session,
+    keys: Iterable[str],
+    defaults: Optional[Dict[str, str]] = None,
+    *,
+    org_id: Optional[UUID] = None,
+) -> Dict[str, str]:
+    """Get several settings at once, with the same lookup order as get_setting.
+
+    Keys missing from the cache are read with one org_settings query and one
+    app_settings query instead of a round trip per key.
+    """
+    defaults = defaults or {}
+    org_key = str(org_id) if org_id else None
+    values: Dict[str, Optional[str]] = {}
+    missing = []
+    for key in keys:
+        value = _setting_cache.get((org_key, key), _MISSING)
+        if value is _MISSING:
+            missing.append(key)
+        else:
+            values[key] = value
+    if missing:
+        values.update(_read_db_settings(db, missing, org_id))
+    return {
+        key: values.get(key) or _cached_env(key) or defaults.get(key, "")
+        for key in keys
+    }
+
+
+def _read_db_settings(db: Session, keys: list, org_id: Optional[UUID]) -> Dict[str, Optional[str]]:
+    """Bulk variant of _read_db_setting; caches clean reads."""
+    org_key = str(org_id) if org_id else None
+    found: Dict[str, Optional[str]] = {}
+    failed = False
+
+    # 1. Org-level overrides
+    if org_id:
+        try:
+            rows = db.query(OrgSetting.key, OrgSetting.value).filter(
+                OrgSetting.org_id == org_id,
+                OrgSetting.key.in_(keys),
+            ).all()
+            found.update((key, value) for key, value in rows if value)
+            for key, value in found.items():
+                _setting_cache.set((org_key, key), value)
+        except Exception as e:
+            failed = True
+            logger.warning(f"Failed to read org settings for org {org_id}: {e}")
+
+    # 2. Global app_settings for whatever the org didn't override
+    remaining = [key for key in keys if key not in found]
+    if remaining:
+        try:
+            rows = db.query(AppSetting.key, AppSetting.value).filter(
+                AppSetting.key.in_(remaining)
+            ).all()
+        except Exception as e:
+            logger.warning(f"Failed to read settings from DB: {e}")
+            return found
+        global_values = dict(rows)
+        for key in remaining:
+            found[key] = global_values.get(key)
+            if not failed:
+                _setting_cache.set((org_key, key), found[key])
+    return found
+
+
+def _read_db_setting(db: Session, key: str, org_id: Optional[UUID]) -> Optional[str]:
+    """Read a setting from org_settings, then app_settings; caches clean reads."""
+    failed = False
+
     # 1. Org-level override
     if org_id:
         try:
-            row = db.query(OrgSetting).filter(
+            value = db.query(OrgSetting.value).filter(
                 OrgSetting.org_id == org_id,
                 OrgSetting.key == key,
-            ).first()
-            if row and row.value:
-                return row.value
+            ).scalar()
+            if value:
+                _setting_cache.set((str(org_id), key), value)
+                return value
         except Exception as e:
+            failed = True
             logger.warning(f"Failed to read org setting {key} for org {org_id}: {e}")
 
     # 2. Global app_settings
     try:
-        row = db.query(AppSetting).filter(AppSetting.key == key).first()
-        if row and row.value:
-            return row.value
+        value = db.query(AppSetting.value).filter(AppSetting.key == key).scalar()
     except Exception as e:
         logger.warning(f"Failed to read setting {key} from DB: {e}")
+        return None
 
-    # 3. Env var / default
-    return os.getenv(key, default)
+    if not failed:
+        _setting_cache.set((str(org_id) if org_id else None, key), value)
+    return value
 
 
 def get_user_org_id(db: Session, user_id: UUID) -> Optional[UUID]:
     """Resolve the org_id for a given user (first membership)."""
+    org_id = _org_cache.get(str(user_id), _MISSING)
+    if org_id is not _MISSING:
+        return org_id
     try:
-        membership = db.query(OrgMember).filter(OrgMember.user_id == user_id).first()
-        if membership:
-            return membership.org_id
+        org_id = db.query(OrgMember.org_id).filter(OrgMember.user_id == user_id).limit(1).scalar()
     except Exception as e:
         logger.warning(f"Failed to resolve org for user {user_id}: {e}")
-    return None
+        return None
+    _org_cache.set(str(user_id), org_id)
+    return org_id